@@ -1,24 +1,25 @@
 
 
+import asyncio
 import json
-import redis
-from django.conf import settings
 from channels.generic.websocket import AsyncWebsocketConsumer
 from uuid import UUID
 from game.tasks import stop_game
 from channels.exceptions import DenyConnection
 from functools import wraps
+from game.game_loop.redis_utils import set_key
+from game.game_loop.status_cache import invalidate_status
+from game.game_loop.local_fanout import PROCESS_TAG, register_consumer, unregister_consumer, is_local_consumer
+from game.game_loop.mailbox import FrameMailbox
+from game.game_loop.wire_protocol import BINARY_SUBPROTOCOL, JSON_SUBPROTOCOL, BINARY_ENABLED, decode_input
+from game.game_loop.game_log import get_log
 
-r = redis.Redis(
-    host=settings.REDIS_HOST,
-    port=settings.REDIS_PORT,
-    db=0
-)
+log = get_log('consumer')
 
 def login_required_json_async(func):
     @wraps(func)
     async def wrapper(self, *args, **kwargs):
-        print(f"[PongConsumer] check login async")
+        log.debug("check login async")
         if not self.scope.get('user', None).is_authenticated:
             raise DenyConnection("Utilisateur non authentifié")
         return await func(self, *args, **kwargs)
@@ -30,25 +31,79 @@ class PongConsumer(AsyncWebsocketConsumer):
         self.game_id = self.scope['url_route']['kwargs']['game_id']
         self.group_name = f"pong_{self.game_id}"
 
-        await self.accept()
+        # Négociation du format : binaire si le client le propose (et s'il est autorisé), JSON sinon
+        subprotocols = self.scope.get('subprotocols', [])
+        self.binary = BINARY_ENABLED and BINARY_SUBPROTOCOL in subprotocols
+        if self.binary:
+            await self.accept(subprotocol=BINARY_SUBPROTOCOL)
+        elif JSON_SUBPROTOCOL in subprotocols:
+            await self.accept(subprotocol=JSON_SUBPROTOCOL)
+        else:
+            await self.accept()
+        # Messages de la boucle de jeu (locale ou via Redis) : déposés dans la mailbox,
+        # envoyés au rythme du client par send_mailbox
+        self.mailbox = FrameMailbox()
+        self.awaiting_keyframe = False
+        self.sender_task = asyncio.create_task(self.send_mailbox())
+        await register_consumer(self.game_id, self.channel_name, self.mailbox)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
-        print(f"[PongConsumer] WebSocket connected for game_id={self.game_id}")
+        log.info("WebSocket connected for game_id=%s (binary=%s)", self.game_id, self.binary)
+
+    async def send_mailbox(self):
+        while True:
+            items, state, dropped = await self.mailbox.take()
+            # Ordre d'arrivée conservé : game_over ne double pas le dernier 'scored'
+            for kind, content in items:
+                if kind == 'state':
+                    await self.send_state(*content)
+                else:
+                    await self.send(text_data=content)
+            if state is not None:
+                await self.send_state(state, dropped)
+
+    async def send_state(self, state, dropped):
+        if self.binary and 'frame' in state:
+            # Frame binaire = état complet : en sauter ne casse rien côté client
+            await self.send(bytes_data=state['frame'])
+            return
+        keyframe = state.get('keyframe', False)
+        if dropped and not keyframe and not self.awaiting_keyframe:
+            # Un delta a été écrasé : la chaîne est rompue, on attend la prochaine keyframe
+            self.awaiting_keyframe = True
+            await self.request_resync()
+        if self.awaiting_keyframe and not keyframe:
+            self.mailbox.drop_taken_state()
+            return
+        self.awaiting_keyframe = False
+        await self.send(text_data=state['text'])
 
     @login_required_json_async
     async def disconnect(self, close_code):
         
-        print(f"[PongConsumer] => disconnect => stop_game({self.game_id})")
+        log.info("disconnect => stop_game(%s)", self.game_id)
+        invalidate_status(self.game_id)
         await stop_game(self.game_id)  
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await unregister_consumer(self.game_id, self.channel_name)
+        if getattr(self, 'sender_task', None) is not None:
+            self.sender_task.cancel()
+            log.info("Mailbox stats for game_id=%s: %s", self.game_id, self.mailbox.stats())
 
     @login_required_json_async
     async def receive(self, text_data=None, bytes_data=None):
         try:
-            
-            data = json.loads(text_data)
+            if bytes_data is not None:
+                data = decode_input(bytes_data)
+                if data is None:
+                    return
+            else:
+                data = json.loads(text_data)
 
             
             action = data.get('action')
+            if action == 'resync':
+                await self.request_resync()
+                return
             if action not in ['start_move', 'stop_move']:
                 return
             player = data.get('player')
@@ -59,32 +114,41 @@ class PongConsumer(AsyncWebsocketConsumer):
                 if direction not in ['up', 'down']:
                     return
             if action == 'start_move':
-                self.start_move_paddle(player, direction)
+                await self.start_move_paddle(player, direction)
             elif action == 'stop_move':
-                self.stop_move_paddle(player)
+                await self.stop_move_paddle(player)
 
         except json.JSONDecodeError:
             pass
         except KeyError:
             pass
 
-    def start_move_paddle(self, player, direction):
+    async def start_move_paddle(self, player, direction):
         velocity = 0
         if direction == 'up':
             velocity = -8  
         elif direction == 'down':
             velocity = 8
 
-        r.set(f"{self.game_id}:paddle_{player}_velocity", velocity)
-        print(f"[PongConsumer] start_move_paddle: player={player}, velocity={velocity}")
+        await set_key(self.game_id, f"paddle_{player}_velocity", velocity)
+        log.debug("start_move_paddle: player=%s, velocity=%s", player, velocity)
 
-    def stop_move_paddle(self, player):
-        r.set(f"{self.game_id}:paddle_{player}_velocity", 0)
-        print(f"[PongConsumer] stop_move_paddle: player={player}")
+    async def stop_move_paddle(self, player):
+        await set_key(self.game_id, f"paddle_{player}_velocity", 0)
+        log.debug("stop_move_paddle: player=%s", player)
+
+    async def request_resync(self):
+        """Le client a raté une frame delta : la boucle enverra une keyframe au prochain broadcast."""
+        await set_key(self.game_id, "resync", 1)
+        log.debug("resync requested for game_id=%s", self.game_id)
 
     
-    async def broadcast_game_state(self, event):
-        await self.send(json.dumps(event['data']))
+    async def game_tick(self, event):
+        """Message unique d'un tick : événements du tick puis game_state, pré-encodés par la boucle de jeu."""
+        # Copie Redis d'un message déjà livré en local par une boucle de ce process
+        if event.get('origin') == PROCESS_TAG and is_local_consumer(self.game_id, self.channel_name):
+            return
+        self.mailbox.put_nowait(event)
         
 
     async def game_over(self, event):
@@ -100,68 +164,17 @@ class PongConsumer(AsyncWebsocketConsumer):
         }
 
 
-        await self.send(text_data=json.dumps(response_data))
-
-    async def powerup_applied(self, event):
-        await self.send(json.dumps({
-            'type': 'powerup_applied',
-            'player': event['player'],
-            'effect': event['effect'],
-            'duration': event['duration']
-        }))
-        print(f"[PongConsumer] Broadcast powerup_applied for game_id={self.game_id}, player={event['player']}, effect={event['effect']}, duration={event['duration']}")
-
-    async def powerup_spawned(self, event):
-        await self.send(json.dumps({
-            'type': 'powerup_spawned',
-            'powerup': event['powerup']
-        }))
-        print(f"[PongConsumer] Broadcast powerup_spawned for game_id={self.game_id}")
+        self.mailbox.put_control(json.dumps(response_data))
 
     async def countdown(self, event):
-        await self.send(json.dumps({
+        self.mailbox.put_control(json.dumps({
             'type': 'countdown',
             'countdown_nb': event['countdown_nb']
         }))
-        print(f"[PongConsumer] Broadcast countdown for game_id={self.game_id}")
-    
-    async def scored(self, event):
-        await self.send(json.dumps({
-            'type': 'scored',
-            'scoreMsg': event['scoreMsg']
-        }))
-        print(f"[PongConsumer] Broadcast countdown for game_id={self.game_id}")
-
-    async def powerup_expired(self, event):
-        await self.send(json.dumps({
-            'type': 'powerup_expired',
-            'powerup': event['powerup']
-        }))
-        print(f"[PongConsumer] Broadcast powerup_expired for game_id={self.game_id}")
-
-    async def bumper_spawned(self, event):
-        await self.send(json.dumps({
-            'type': 'bumper_spawned',
-            'bumper': event['bumper']
-        }))
-        print(f"[PongConsumer] Broadcast bumper_spawned for game_id={self.game_id}")
-
-    async def bumper_expired(self, event):
-        await self.send(json.dumps({
-            'type': 'bumper_expired',
-            'bumper': event['bumper']
-        }))
-        print(f"[PongConsumer] Broadcast bumper_expired for game_id={self.game_id}")
-
-    async def collision_event(self, event):
-        await self.send(json.dumps({
-            'type': 'collision_event',
-            'collision': event['collision']
-        }))
-        print(f"[PongConsumer] Broadcast collision_event for game_id={self.game_id}")
+        log.debug("Broadcast countdown for game_id=%s", self.game_id)
 
     async def game_aborted(self, event):
-        await self.send(json.dumps({
+        self.mailbox.put_control(json.dumps({
             'type': 'game_aborted',
         }))
-        print(f"[PongConsumer] game_aborted for game_id={self.game_id}")
+        log.info("game_aborted for game_id=%s", self.game_id)
@@ -1,45 +1,45 @@
 
 
+import json
 from channels.layers import get_channel_layer
-from .redis_utils import get_key
+from .wire_protocol import BINARY_ENABLED, encode_game_state
+from .local_fanout import publish
+from .game_log import get_log
 
+log = get_log('broadcast')
 
 
-async def broadcast_game_state(game_id, channel_layer, paddle_left, paddle_right, ball, powerup_orbs, bumpers):
-    """
-    Envoie l'état actuel du jeu aux clients via WebSocket.
-    """
-    
+
+def game_state_fields(world):
+    """État courant de la partie, tel que dessiné par les clients."""
+    paddle_left = world.paddle_left
+    paddle_right = world.paddle_right
+    ball = world.ball
+
     powerups_data = []
-    for powerup_orb in powerup_orbs:
-        active = get_key(game_id, f"powerup_{powerup_orb.effect_type}_active" or 0)
-        if active and active.decode('utf-8') == '1':
-            x = float(get_key(game_id, f"powerup_{powerup_orb.effect_type}_x") or 0)
-            y = float(get_key(game_id, f"powerup_{powerup_orb.effect_type}_y") or 0)
+    for powerup_orb in world.powerup_orbs:
+        if powerup_orb.active:
             powerups_data.append({
+                'id': powerup_orb.id,
                 'type': powerup_orb.effect_type,
-                'x': x,
-                'y': y,
-                'color': list(powerup_orb.color)  
+                'x': powerup_orb.x,
+                'y': powerup_orb.y,
+                'color': list(powerup_orb.color)
             })
 
-    
-    
+
     bumpers_data = []
-    for bumper in bumpers:
-        active = get_key(game_id, f"bumper_{bumper.x}_{bumper.y}_active" or 0)
-        if active and active.decode('utf-8') == '1':
-            x = float(get_key(game_id, f"bumper_{bumper.x}_{bumper.y}_x") or 0)
-            y = float(get_key(game_id, f"bumper_{bumper.x}_{bumper.y}_y") or 0)
+    for bumper in world.bumpers:
+        if bumper.active:
             bumpers_data.append({
-                'x': x,
-                'y': y,
+                'id': bumper.id,
+                'x': bumper.x,
+                'y': bumper.y,
                 'size': bumper.size,
-                'color': list(bumper.color)  
+                'color': list(bumper.color)
             })
 
-    data = {
-        'type': 'game_state',
+    return {
         'ball_x': ball.x,
         'ball_y': ball.y,
         'ball_size': ball.size,
@@ -50,38 +50,61 @@ async def broadcast_game_state(game_id, channel_layer, paddle_left, paddle_right
         'paddle_width': paddle_left.width,
         'paddle_left_height': paddle_left.height,
         'paddle_right_height': paddle_right.height,
-        'score_left': int(get_key(game_id, "score_left") or 0),
-        'score_right': int(get_key(game_id, "score_right") or 0),
+        'score_left': world.score_left,
+        'score_right': world.score_right,
         'powerups': powerups_data,
         'bumpers': bumpers_data,
-        'flash_effect': bool(get_key(game_id, f"flash_effect"))
+        'flash_effect': world.has_effect("flash_effect")
     }
-    
-
-    await channel_layer.group_send(f"pong_{game_id}", {
-        'type': 'broadcast_game_state',
-        'data': data
-    })
-    
-
-
 
 
-
-async def notify_powerup_spawned(game_id, powerup_orb):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'powerup_spawned',
-            'powerup': {
-                'type': powerup_orb.effect_type,
-                'x': powerup_orb.x,
-                'y': powerup_orb.y,
-                'color': list(powerup_orb.color)
-            }
+async def flush_tick(world, channel_layer, send_state=True):
+    """
+    Envoie UN message par tick : les événements du tick (dans l'ordre où ils ont eu lieu)
+    puis, si send_state, l'état du jeu (keyframe ou delta selon le StateEncoder ; rien
+    si aucun champ n'a changé).
+    Tout est sérialisé une seule fois ici ; les consumers envoient tels quels :
+    'events' : {"type": "events", "events": [...]} déjà encodé en JSON,
+    'text'   : frame game_state JSON déjà encodée,
+    'frame'  : même état en binaire complet, pour les clients du sous-protocole binaire.
+    'keyframe' : présent si 'text' est une keyframe (une FrameMailbox peut reprendre dessus).
+    """
+    message = {'type': 'game_tick'}
+    if world.events:
+        message['events'] = encode_json_frame({'type': 'events', 'events': world.events})
+        world.events = []
+
+    if send_state:
+        state = game_state_fields(world)
+        data = world.state_encoder.encode(world.tick, state)
+        if data is not None:
+            message['text'] = encode_json_frame(data)
+            if data['type'] == 'game_state':
+                message['keyframe'] = True
+            if BINARY_ENABLED:
+                message['frame'] = encode_game_state(world.tick, state)
+
+    if len(message) > 1:
+        await publish(channel_layer, world.game_id, message)
+
+
+def encode_json_frame(data):
+    return json.dumps(data, separators=(',', ':'))
+
+
+# Événements d'un tick : ajoutés au buffer de la partie, envoyés par flush_tick
+
+async def notify_powerup_spawned(world, powerup_orb):
+    world.queue_event({
+        'type': 'powerup_spawned',
+        'powerup': {
+            'id': powerup_orb.id,
+            'type': powerup_orb.effect_type,
+            'x': powerup_orb.x,
+            'y': powerup_orb.y,
+            'color': list(powerup_orb.color)
         }
-    )
+    })
 
 async def notify_countdown(game_id, countdown_nb):
     channel_layer = get_channel_layer()
@@ -93,112 +116,92 @@ async def notify_countdown(game_id, countdown_nb):
         }
     )
 
-async def notify_scored(game_id):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'scored',
-            'scoreMsg': 'GOAL'
-        }
-    )
+async def notify_scored(world):
+    world.queue_event({
+        'type': 'scored',
+        'scoreMsg': 'GOAL'
+    })
 
 
-async def notify_powerup_applied(game_id, player, effect, effect_duration):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'powerup_applied',
-            'player': player,
-            'effect': effect,
-            'duration': effect_duration
-        }
-    )
+async def notify_powerup_applied(world, player, effect, effect_duration):
+    world.queue_event({
+        'type': 'powerup_applied',
+        'player': player,
+        'effect': effect,
+        'duration': effect_duration
+    })
 
-async def notify_powerup_expired(game_id, powerup_orb):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'powerup_expired',
-            'powerup': {
-                'type': powerup_orb.effect_type,
-                'x': powerup_orb.x,
-                'y': powerup_orb.y
-            }
+async def notify_powerup_expired(world, powerup_orb):
+    world.queue_event({
+        'type': 'powerup_expired',
+        'powerup': {
+            'id': powerup_orb.id,
+            'type': powerup_orb.effect_type,
+            'x': powerup_orb.x,
+            'y': powerup_orb.y
         }
-    )
+    })
 
 
-async def notify_bumper_spawned(game_id, bumper):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'bumper_spawned',
-            'bumper': {
-                'x': bumper.x,
-                'y': bumper.y,
-            }
+async def notify_bumper_spawned(world, bumper):
+    world.queue_event({
+        'type': 'bumper_spawned',
+        'bumper': {
+            'id': bumper.id,
+            'x': bumper.x,
+            'y': bumper.y,
         }
-    )
+    })
 
 
-async def notify_bumper_expired(game_id, bumper):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'bumper_expired',
-            'bumper': {
-                'x': bumper.x,
-                'y': bumper.y
-            }
+async def notify_bumper_expired(world, bumper):
+    world.queue_event({
+        'type': 'bumper_expired',
+        'bumper': {
+            'id': bumper.id,
+            'x': bumper.x,
+            'y': bumper.y
         }
-    )
+    })
 
 
-async def notify_collision(game_id, collision_info):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
-        f"pong_{game_id}",
-        {
-            'type': 'collision_event',
-            'collision': collision_info
-        }
-    )
+async def notify_collision(world, collision_info):
+    world.queue_event({
+        'type': 'collision_event',
+        'collision': collision_info
+    })
 
-async def notify_paddle_collision(game_id, paddle_side, ball):
+async def notify_paddle_collision(world, paddle_side, ball):
     collision_info = {
         'type': 'paddle_collision',
         'paddle_side': paddle_side,
         'new_speed_x': ball.speed_x,
         'new_speed_y': ball.speed_y,
     }
-    await notify_collision(game_id, collision_info)
+    await notify_collision(world, collision_info)
 
-    print(f"[collisions.py] Ball collided with {paddle_side} paddle. New speed: ({ball.speed_x}, {ball.speed_y})")
+    log.debug("Ball collided with %s paddle. New speed: (%s, %s)", paddle_side, ball.speed_x, ball.speed_y)
 
-async def notify_border_collision(game_id, border_side, ball):
+async def notify_border_collision(world, border_side, ball):
     collision_info = {
         'type': 'border_collision',
         'border_side': border_side,
         'coor_x_collision': ball.x,
     }
-    await notify_collision(game_id, collision_info)
+    await notify_collision(world, collision_info)
 
-    print(f"[collisions.py] Ball collided with {border_side} border at coor x = {ball.x}.")
+    log.debug("Ball collided with %s border at coor x = %s.", border_side, ball.x)
 
-async def notify_bumper_collision(game_id, bumper, ball):
+async def notify_bumper_collision(world, bumper, ball):
     collision_info = {
         'type': 'bumper_collision',
+        'bumper_id': bumper.id,
         'bumper_x': bumper.x,
         'bumper_y': bumper.y,
         'new_speed_x': ball.speed_x,
         'new_speed_y': ball.speed_y,
     }
-    await notify_collision(game_id, collision_info)
+    await notify_collision(world, collision_info)
 
 
 
@@ -210,7 +213,7 @@ async def notify_game_finished(game_id, tournament_id, winner, looser):
     winner_serializable = winner.username if hasattr(winner, 'username') else winner
     looser_serializable = looser.username if hasattr(looser, 'username') else looser
 
-    print(f"[broadcast.py] notify_game_finished winner: {winner_serializable} looser: {looser_serializable} tournament_id: {tournament_id}")
+    log.info("notify_game_finished winner: %s looser: %s tournament_id: %s", winner_serializable, looser_serializable, tournament_id)
     channel_layer = get_channel_layer()
     await channel_layer.group_send(
         f"pong_{game_id}",
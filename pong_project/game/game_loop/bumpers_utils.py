@@ -1,78 +1,65 @@
 
 
-import time
-from .redis_utils import get_key, set_key, delete_key
-from .dimensions_utils import get_terrain_rect
 from .broadcast import notify_bumper_spawned, notify_bumper_expired
-from .powerups_utils import get_active_objects
 import random
+from .game_log import get_log
+
+log = get_log('bumpers')
 
 MAX_ACTIVE_BUMPERS = 3
 SPAWN_INTERVAL_BUMPERS = 5
-async def handle_bumpers_spawn(game_id, bumpers, current_time, powerup_orbs):
+async def handle_bumpers_spawn(world):
+    """Apparition d'un bumper toutes les SPAWN_INTERVAL_BUMPERS s de jeu (échéance propre à la partie)."""
+    game_id = world.game_id
+    bumpers = world.bumpers
     
-    if not hasattr(handle_bumpers_spawn, "last_bumper_spawn_time") or handle_bumpers_spawn.last_bumper_spawn_time is None:
-        handle_bumpers_spawn.last_bumper_spawn_time = current_time  
+    if world.next_bumper_spawn_tick is None:
+        world.next_bumper_spawn_tick = world.tick + world.timers.ticks_for(SPAWN_INTERVAL_BUMPERS)
         return
     
-    if current_time - handle_bumpers_spawn.last_bumper_spawn_time >= SPAWN_INTERVAL_BUMPERS:
-        
-        active_powerups, active_bumpers = get_active_objects(powerup_orbs, bumpers)
-        print(f"[DEBUG] Attempting bumper spawn with {len(active_powerups)} active powerups and {len(active_bumpers)} active bumpers")
-
-        active_bumpers = count_active_bumpers(game_id, bumpers)
+    if world.tick >= world.next_bumper_spawn_tick:
+        active_bumpers = count_active_bumpers(bumpers)
         if active_bumpers < MAX_ACTIVE_BUMPERS:
             
-            bumper = random.choice(bumpers)
-            if not bumper.active:
-                terrain = get_terrain_rect(game_id)
-                spawned = await spawn_bumper(game_id, bumper, terrain, powerup_orbs, bumpers)
+            available_bumpers = [bumper for bumper in bumpers if not bumper.active]
+            if available_bumpers:
+                bumper = random.choice(available_bumpers)
+                spawned = await spawn_bumper(world, bumper)
                 if spawned:
                     
-                    handle_bumpers_spawn.last_bumper_spawn_time = current_time
-                    print(f"[game_loop.py] game_id={game_id} - Bumper spawned at ({bumper.x}, {bumper.y}).")
+                    world.next_bumper_spawn_tick = world.tick + world.timers.ticks_for(SPAWN_INTERVAL_BUMPERS)
 
 
-async def spawn_bumper(game_id, bumper, terrain_rect, powerup_orbs, bumpers): 
-    if bumper.spawn(terrain_rect, powerup_orbs, bumpers):
-        set_bumper_redis(game_id, bumper)
-        print(f"[game_loop.py] Bumper spawned at ({bumper.x}, {bumper.y})")
-        await notify_bumper_spawned(game_id, bumper)
+async def spawn_bumper(world, bumper):
+    if bumper.spawn(world.placement):
+        bumper.activate()
+        bumper.expiry_timer = world.timers.schedule(bumper.duration, expire_bumper, world, bumper)
+        log.debug("game_id=%s - Bumper %s spawned at (%s, %s)", world.game_id, bumper.id, bumper.x, bumper.y)
+        await notify_bumper_spawned(world, bumper)
         return True
     return False
 
-def count_active_bumpers(game_id, bumpers):
+def count_active_bumpers(bumpers):
     count = 0
     for bumper in bumpers:
-        
-        active = get_key(game_id, f"bumper_{bumper.x}_{bumper.y}_active") or 0
-        if active and active.decode('utf-8') == '1':
-        
+        if bumper.active:
             count += 1
-    print(f"[loop.py] count_active_bumpers ({count})")
     return count
 
-async def handle_bumper_expiration(game_id, bumpers):
-    current_time = time.time()
-    for bumper in bumpers:
-        active = get_key(game_id, f"bumper_{bumper.x}_{bumper.y}_active") or 0
-        
-        if active and active.decode('utf-8') == '1'and current_time - bumper.spawn_time >= bumper.duration:
-        
-            delete_bumper_redis(game_id, bumper)
-            print(f"[loop.py] Bumper at ({bumper.x}, {bumper.y}) expired")
-            await notify_bumper_expired(game_id, bumper)
-
-
-def set_bumper_redis(game_id, bumper):
-    bumper.activate()
-    set_key(game_id, f"bumper_{bumper.x}_{bumper.y}_active", 1)
-    set_key(game_id, f"bumper_{bumper.x}_{bumper.y}_x", bumper.x)
-    set_key(game_id, f"bumper_{bumper.x}_{bumper.y}_y", bumper.y)
+async def expire_bumper(world, bumper):
+    bumper.expiry_timer = None
+    deactivate_bumper(world, bumper)
+    log.debug("Bumper %s at (%s, %s) expired", bumper.id, bumper.x, bumper.y)
+    await notify_bumper_expired(world, bumper)
 
 
-def delete_bumper_redis(game_id, bumper):
+def deactivate_bumper(world, bumper):
+    """Désactive le bumper ; ses clés (bumper_<id>_*) sont mises à jour au prochain flush du tick."""
+    if bumper.expiry_timer is not None:
+        world.timers.cancel(bumper.expiry_timer)
+        bumper.expiry_timer = None
+    world.placement.release(bumper)
     bumper.deactivate()
-    delete_key(game_id, f"bumper_{bumper.x}_{bumper.y}_active")
-    delete_key(game_id, f"bumper_{bumper.x}_{bumper.y}_x")
-    delete_key(game_id, f"bumper_{bumper.x}_{bumper.y}_y")
\ No newline at end of file
+    world.batch.set(f"bumper_{bumper.id}_active", 0)
+    world.batch.delete(f"bumper_{bumper.id}_x")
+    world.batch.delete(f"bumper_{bumper.id}_y")
\ No newline at end of file
@@ -1,187 +1,257 @@
 
 
 import math
-import random
 import time
-from asgiref.sync import sync_to_async
-from .ball_utils import  stick_ball_to_paddle, manage_ball_speed_and_angle, update_ball_redis
-from .redis_utils import get_key, set_key, delete_key
+from .ball_utils import stick_ball_to_paddle, manage_ball_speed_and_angle
 from .powerups_utils import apply_powerup
-from .broadcast import notify_paddle_collision, notify_border_collision, notify_bumper_collision, notify_powerup_applied
+from .broadcast import notify_paddle_collision, notify_border_collision, notify_bumper_collision
 
 MIN_SPEED = 1.0
 
 
 
-async def handle_scoring_or_paddle_collision(game_id, paddle_left, paddle_right, ball):
-    """
-    Gère le fait qu'on marque un point ou qu'on ait juste un rebond sur la raquette.
-    Retourne 'score_left', 'score_right' ou None si on continue le jeu.
-    """
-    
-    
-    if ball.x + ball.size <= paddle_left.x + paddle_left.width and not (paddle_left.y <= ball.y <= paddle_left.y + paddle_left.height):
-        return 'score_right'
-    if ball.x - ball.size >= paddle_right.x - paddle_right.width and not (paddle_right.y <= ball.y <= paddle_right.y + paddle_right.height):
-        return 'score_left'
-    
-    
-    
-    if ball.speed_x < 0 and (ball.x - ball.size) <= (paddle_left.x + paddle_left.width):
-        if paddle_left.y <= ball.y <= paddle_left.y + paddle_left.height:
-            
-            ball.x = paddle_left.x + paddle_left.width + ball.size
-            await process_paddle_collision(game_id, 'left', paddle_left, ball)
-            return None
-
-    
-    
-    if ball.speed_x > 0 and (ball.x + ball.size) >= (paddle_right.x - paddle_right.width):
-        if paddle_right.y <= ball.y <= paddle_right.y + paddle_right.height:
-            
-            ball.x = paddle_right.x - paddle_right.width - ball.size
-            await process_paddle_collision(game_id, 'right', paddle_right, ball)
-            return None
-
-    return None
-
-async def handle_scoring_or_paddle_collision(game_id, paddle_left, paddle_right, ball):
+async def handle_scoring_or_paddle_collision(world):
     """
     Gère le fait qu'on marque un point ou qu'on ait juste un rebond sur la raquette.
     (Prend en compte le "sticky".)
     Retourne 'score_left', 'score_right' ou None.
     """
+    paddle_left = world.paddle_left
+    paddle_right = world.paddle_right
+    ball = world.ball
 
-    
-    is_stuck = bool(get_key(game_id, "ball_stuck") or 0)
-    if is_stuck:
+    if world.ball_stuck:
         return None
 
-    
+
     if ball.x + ball.size <= paddle_left.x + paddle_left.width \
        and not (paddle_left.y <= ball.y <= paddle_left.y + paddle_left.height):
         return 'score_right'
 
-    
+
     if ball.x - ball.size >= paddle_right.x - paddle_right.width \
        and not (paddle_right.y <= ball.y <= paddle_right.y + paddle_right.height):
         return 'score_left'
-    
-    
+
+
     if ball.speed_x < 0 and (ball.x - ball.size) <= (paddle_left.x + paddle_left.width):
         if paddle_left.y <= ball.y <= paddle_left.y + paddle_left.height:
-            
+
             ball.x = paddle_left.x + paddle_left.width + ball.size
-            is_sticky = bool(get_key(game_id, "paddle_left_sticky") or 0)
-            if is_sticky : 
-                is_already_stuck = bool(get_key(game_id, "ball_stuck") or 0)
-                if not is_already_stuck:
-                    
-                    stick_ball_to_paddle(game_id, 'left', paddle_left, ball)
-                    set_key(game_id, "paddle_left_already_stuck", 1)
+            if paddle_left.modifiers.sticky:
+                stick_ball_to_paddle(world, 'left', paddle_left)
                 return None
             else:
                 ball.last_player = 'left'
-                await process_paddle_collision(game_id, 'left', paddle_left, ball)
+                await process_paddle_collision(world, 'left', paddle_left)
                 return None
 
-    
+
     if ball.speed_x > 0 and (ball.x + ball.size) >= (paddle_right.x - paddle_right.width):
         if paddle_right.y <= ball.y <= paddle_right.y + paddle_right.height:
-            
+
             ball.x = paddle_right.x - paddle_right.width - ball.size
-            is_sticky = bool(get_key(game_id, "paddle_right_sticky") or 0)
-            if is_sticky:
-                is_already_stuck = bool(get_key(game_id, "ball_stuck") or 0)
-                if not is_already_stuck:
-                    
-                    stick_ball_to_paddle(game_id, 'right', paddle_right, ball)
-                    set_key(game_id, "paddle_right_already_stuck", 1)
+            if paddle_right.modifiers.sticky:
+                stick_ball_to_paddle(world, 'right', paddle_right)
                 return None
             else:
                 ball.last_player = 'right'
-                await process_paddle_collision(game_id, 'right', paddle_right, ball)
+                await process_paddle_collision(world, 'right', paddle_right)
                 return None
 
     return None
 
 
 
-async def process_paddle_collision(game_id, paddle_side, current_paddle, ball):
+async def process_paddle_collision(world, paddle_side, current_paddle):
     """
     Gère la logique de collision entre la balle et une raquette.
-    Ajuste la vitesse et la direction de la balle, met à jour Redis et notifie les clients.
+    Ajuste la vitesse et la direction de la balle et notifie les clients.
     """
-    print("process_paddle_collision")
 
-    ball.last_player = paddle_side 
-    
-    manage_ball_speed_and_angle(game_id, current_paddle, paddle_side, ball)
+    ball = world.ball
+    ball.last_player = paddle_side
 
+    manage_ball_speed_and_angle(world, current_paddle, paddle_side)
 
+    await notify_paddle_collision(world, paddle_side, ball)
 
 
-    
-    update_ball_redis(game_id, ball)
+# Limites du terrain pour le centre de la balle : bord - rayon
+TERRAIN_TOP = 50
+TERRAIN_BOTTOM = 350
 
-    
-    await notify_paddle_collision(game_id, paddle_side, ball)
-    
+# Nombre maximal d'impacts résolus dans un même tick (coins, bumper contre un mur...)
+MAX_IMPACTS_PER_TICK = 4
 
-async def handle_border_collisions(game_id, ball):
+
+def wall_impact(ball, remaining):
+    """Instant (fraction du tick) où la balle touche un mur, ou None."""
+    if ball.speed_y < 0:
+        if ball.y - ball.size <= TERRAIN_TOP:
+            return 0.0, "up"
+        t = (TERRAIN_TOP + ball.size - ball.y) / ball.speed_y
+        if t <= remaining:
+            return t, "up"
+    elif ball.speed_y > 0:
+        if ball.y + ball.size >= TERRAIN_BOTTOM:
+            return 0.0, "down"
+        t = (TERRAIN_BOTTOM - ball.size - ball.y) / ball.speed_y
+        if t <= remaining:
+            return t, "down"
+    return None
+
+
+def paddle_impact(world, remaining):
     """
-    Gère les collisions avec les bords supérieur et inférieur.
-    Ajuste la vitesse de la balle en conséquence.
+    Instant où la balle atteint la face avant d'une raquette en la touchant, ou None.
+    La face gauche est en paddle.x + width, la face droite en paddle.x - width (même géométrie
+    que handle_scoring_or_paddle_collision).
     """
-    if ball.y - ball.size <= 50:
-        border_side = "up"
-        ball.speed_y = abs(ball.speed_y)  
-        update_ball_redis(game_id, ball)
-        await notify_border_collision(game_id, border_side, ball)
+    ball = world.ball
+    if ball.speed_x < 0:
+        paddle, side = world.paddle_left, 'left'
+        contact_x = paddle.x + paddle.width + ball.size
+        if ball.x < contact_x:
+            return None
+    elif ball.speed_x > 0:
+        paddle, side = world.paddle_right, 'right'
+        contact_x = paddle.x - paddle.width - ball.size
+        if ball.x > contact_x:
+            return None
+    else:
+        return None
 
-    elif ball.y + ball.size >= 350:
-        border_side = "down"
-        ball.speed_y = -abs(ball.speed_y)  
-        update_ball_redis(game_id, ball)
-        await notify_border_collision(game_id, border_side, ball)
+    t = (contact_x - ball.x) / ball.speed_x
+    if t > remaining:
+        return None
+    y_at_impact = ball.y + ball.speed_y * t
+    if not (paddle.y <= y_at_impact <= paddle.y + paddle.height):
+        return None
+    return t, side
+
+
+def circle_impact(ball, cx, cy, radius, remaining, solid=True):
+    """
+    Premier instant où la balle (segment parcouru) entre dans le cercle (cx, cy, radius), ou None.
+    Une balle déjà dans le cercle touche à t = 0 ; pour un obstacle (solid) seulement
+    si elle s'en rapproche encore.
+    """
+    px, py = ball.x - cx, ball.y - cy
+    dx, dy = ball.speed_x, ball.speed_y
+    a = dx * dx + dy * dy
+    b = px * dx + py * dy
+    c = px * px + py * py - radius * radius
+    if c <= 0:
+        return 0.0 if b < 0 or not solid else None
+    if a == 0 or b >= 0:
+        return None
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= remaining else None
+
+
+def advance(ball, t):
+    ball.x += ball.speed_x * t
+    ball.y += ball.speed_y * t
+
+
+async def advance_ball(world):
+    """
+    Déplace la balle d'un tick avec détection continue des collisions.
+    Murs, raquettes, bumpers et orbes sont testés sur tout le segment parcouru : le
+    premier impact est résolu à son instant exact, puis la balle repart avec sa
+    nouvelle vitesse pour le temps restant. Une balle rapide ne traverse plus rien.
+    """
+    ball = world.ball
+    remaining = 1.0
+
+    for _ in range(MAX_IMPACTS_PER_TICK):
+        impact = None   # (t, kind, target)
 
+        wall = wall_impact(ball, remaining)
+        if wall is not None:
+            impact = (wall[0], 'wall', wall[1])
 
-async def handle_bumper_collision(game_id, ball, bumpers):
+        paddle = paddle_impact(world, remaining)
+        if paddle is not None and (impact is None or paddle[0] < impact[0]):
+            impact = (paddle[0], 'paddle', paddle[1])
+
+        for bumper in world.bumpers:
+            if bumper.active:
+                t = circle_impact(ball, bumper.x, bumper.y, ball.size + bumper.size, remaining)
+                if t is not None and (impact is None or t < impact[0]):
+                    impact = (t, 'bumper', bumper)
+
+        t = impact[0] if impact is not None else remaining
+        await handle_powerup_collision(world, t)
+        advance(ball, t)
+        remaining -= t
+
+        if impact is None:
+            return
+        kind, target = impact[1], impact[2]
+        if kind == 'wall':
+            await resolve_border_collision(world, target)
+        elif kind == 'bumper':
+            await resolve_bumper_collision(world, target)
+        else:
+            await resolve_paddle_collision(world, target)
+            if world.ball_stuck:
+                return
+
+    advance(ball, remaining)
+
+
+async def resolve_border_collision(world, border_side):
+    """Rebond sur le mur <border_side> ('up' ou 'down') et notification des clients."""
+    ball = world.ball
+    if border_side == "up":
+        ball.speed_y = abs(ball.speed_y)
+    else:
+        ball.speed_y = -abs(ball.speed_y)
+    await notify_border_collision(world, border_side, ball)
+
+
+async def resolve_bumper_collision(world, bumper):
     """
-    Gère les collisions entre la balle et les bumpers.
-    Ajuste la vitesse et la direction de la balle, met à jour Redis et notifie les clients.
+    Rebond sur un bumper : la balle repart selon la normale au point de contact,
+    à vitesse inchangée, et les clients sont notifiés.
     """
-    current_time = time.time()
-    for bumper in bumpers:
-        if bumper.active:
-            dist = math.hypot(ball.x - bumper.x, ball.y - bumper.y)
-            if dist <= ball.size + bumper.size:
-                
-                angle = math.atan2(ball.y - bumper.y, ball.x - bumper.x)
-                speed = math.hypot(ball.speed_x, ball.speed_y)
-                ball.speed_x = speed * math.cos(angle)
-                ball.speed_y = speed * math.sin(angle)
-
-                
-                update_ball_redis(game_id, ball)
-
-                
-                bumper.last_collision_time = current_time
-
-                
-                await notify_bumper_collision(game_id, bumper, ball)
-                    
-
-async def handle_powerup_collision(game_id, ball, powerup_orbs):
+    ball = world.ball
+    angle = math.atan2(ball.y - bumper.y, ball.x - bumper.x)
+    speed = math.hypot(ball.speed_x, ball.speed_y)
+    ball.speed_x = speed * math.cos(angle)
+    ball.speed_y = speed * math.sin(angle)
+
+    bumper.last_collision_time = time.time()
+
+    await notify_bumper_collision(world, bumper, ball)
+
+
+async def resolve_paddle_collision(world, paddle_side):
+    """La balle est au contact de la face avant de la raquette : sticky ou rebond."""
+    current_paddle = world.get_paddle(paddle_side)
+    if current_paddle.modifiers.sticky:
+        stick_ball_to_paddle(world, paddle_side, current_paddle)
+    else:
+        world.ball.last_player = paddle_side
+        await process_paddle_collision(world, paddle_side, current_paddle)
+
+
+async def handle_powerup_collision(world, duration=0.0):
     """
-    Vérifie si la balle a ramassé un power-up en dehors des collisions avec les paddles.
-    Applique l'effet du power-up au joueur concerné, met à jour Redis et notifie les clients.
+    Vérifie si la balle ramasse un power-up pendant les <duration> prochaines fractions de tick.
+    Applique l'effet du power-up au joueur concerné et notifie les clients.
     """
-    for powerup_orb in powerup_orbs:
+    ball = world.ball
+    for powerup_orb in world.powerup_orbs:
         if powerup_orb.active:
-            dist = math.hypot(ball.x - powerup_orb.x, ball.y - powerup_orb.y)
-            if dist <= ball.size + powerup_orb.size:
-                
+            t = circle_impact(ball, powerup_orb.x, powerup_orb.y, ball.size + powerup_orb.size, duration, solid=False)
+            if t is not None:
+
                 last_player = ball.last_player
                 if last_player:
-                    await apply_powerup(game_id, last_player, powerup_orb)
+                    await apply_powerup(world, last_player, powerup_orb)
@@ -0,0 +1,98 @@
+# game/game_loop/db_executor.py
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection, Error as DatabaseError
+
+# Pool de threads réservé au moteur de jeu : chaque thread garde sa propre connexion
+# Postgres, et les requêtes des parties ne passent plus par le thread unique
+# partagé avec les vues synchrones (sync_to_async thread_sensitive=True).
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.GAME_DB_EXECUTOR_WORKERS,
+    thread_name_prefix="game-db"
+)
+
+
+class DBExecutorStats:
+    """Compteurs du pool : temps d'attente dans la file et durée d'exécution."""
+    def __init__(self, window=1000):
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self.recent_waits = deque(maxlen=window)
+
+    def record_wait(self, wait):
+        self.started += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+
+    def record_run(self, run, failed):
+        self.completed += 1
+        self.total_run += run
+        if failed:
+            self.errors += 1
+
+    def as_dict(self):
+        waits = sorted(self.recent_waits)
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+        return {
+            'workers': settings.GAME_DB_EXECUTOR_WORKERS,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'errors': self.errors,
+            'queued': self.submitted - self.started,
+            'in_flight': self.submitted - self.completed,
+            'started': self.started,
+            'wait_total_ms': self.total_wait * 1000,
+            'wait_avg_ms': (self.total_wait / self.started * 1000) if self.started else 0.0,
+            'wait_p50_ms': percentile(0.50) * 1000,
+            'wait_p99_ms': percentile(0.99) * 1000,
+            'wait_max_ms': self.max_wait * 1000,
+            'run_avg_ms': (self.total_run / self.completed * 1000) if self.completed else 0.0,
+        }
+
+
+STATS = DBExecutorStats()
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    Exécute une fonction ORM synchrone sur le pool du moteur de jeu et attend son résultat.
+    """
+    submitted_at = time.monotonic()
+    STATS.submitted += 1
+
+    def job():
+        started_at = time.monotonic()
+        STATS.record_wait(started_at - submitted_at)
+        failed = False
+        # Comme le cycle requête/réponse de Django : une connexion trop vieille (CONN_MAX_AGE)
+        # ou inutilisable (coupée par le serveur) est fermée, la requête en rouvre une
+        connection.close_if_unusable_or_obsolete()
+        try:
+            return func(*args, **kwargs)
+        except DatabaseError:
+            failed = True
+            # Connexion potentiellement cassée : on la ferme, le prochain appel en rouvrira une
+            connection.close()
+            raise
+        finally:
+            STATS.record_run(time.monotonic() - started_at, failed)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, job)
+
+
+def get_db_executor_stats():
+    return STATS.as_dict()
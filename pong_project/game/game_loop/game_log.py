@@ -0,0 +1,162 @@
+# game/game_loop/game_log.py
+
+import logging
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from django.conf import settings
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+
+def parse_level(name):
+    level = logging.getLevelName(str(name).strip().upper())
+    return level if isinstance(level, int) else INFO
+
+
+def parse_categories(spec):
+    """'collisions=DEBUG,consumer=WARNING' -> { 'collisions': 10, 'consumer': 30 }"""
+    levels = {}
+    for item in spec.split(','):
+        if '=' in item:
+            category, level = item.split('=', 1)
+            levels[category.strip()] = parse_level(level)
+    return levels
+
+
+DEFAULT_LEVEL = parse_level(settings.GAME_LOG_LEVEL)
+CATEGORY_LEVELS = parse_categories(settings.GAME_LOG_CATEGORIES)
+
+# Messages DEBUG : un sur DEBUG_SAMPLE est écrit (1 = tous)
+DEBUG_SAMPLE = max(1, settings.GAME_LOG_DEBUG_SAMPLE)
+
+# Au plus RATE_LIMIT messages DEBUG/INFO par seconde et par catégorie (0 = pas de limite)
+RATE_LIMIT = settings.GAME_LOG_RATE_LIMIT
+
+# Mémoire des derniers messages (même ceux non écrits), vidée à la demande : dump_ring()
+# ou `kill -USR1 <pid>`. deque(maxlen) : append atomique sous le GIL, sans verrou.
+RING_LEVEL = parse_level(settings.GAME_LOG_RING_LEVEL)
+RING = deque(maxlen=settings.GAME_LOG_RING_SIZE) if settings.GAME_LOG_RING_SIZE > 0 else None
+
+# Sortie sur stdout comme les anciens print(), indépendante de la config logging de Django
+_root = logging.getLogger("game.engine")
+if not _root.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s %(message)s"))
+    _root.addHandler(_handler)
+    _root.setLevel(DEBUG)
+    _root.propagate = False
+
+
+class GameLog:
+    """
+    Logger d'UNE catégorie (collisions, powerups, consumer...).
+    Le niveau est vérifié avant toute mise en forme : un appel sous le niveau (et sous
+    celui du ring) coûte une comparaison. Les arguments sont formatés par logging
+    uniquement si le message est écrit, au format '%s' comme logger.debug().
+    Dans les boucles, tester log.debug_enabled avant de préparer des arguments coûteux.
+    """
+    def __init__(self, category):
+        self.category = category
+        self.logger = _root.getChild(category)
+        self.level = CATEGORY_LEVELS.get(category, DEFAULT_LEVEL)
+        self.min_level = min(self.level, RING_LEVEL) if RING is not None else self.level
+        self.debug_enabled = self.min_level <= DEBUG
+
+        self.sampled = 0
+        self.window_start = 0.0
+        self.window_count = 0
+        self.suppressed = 0
+
+    def debug(self, msg, *args):
+        if DEBUG >= self.min_level:
+            self.log(DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        if INFO >= self.min_level:
+            self.log(INFO, msg, args)
+
+    def warning(self, msg, *args):
+        if WARNING >= self.min_level:
+            self.log(WARNING, msg, args)
+
+    def error(self, msg, *args):
+        if ERROR >= self.min_level:
+            self.log(ERROR, msg, args)
+
+    def exception(self, msg, *args):
+        self.logger.exception(msg, *args)
+
+    def log(self, level, msg, args):
+        if RING is not None and level >= RING_LEVEL:
+            RING.append((time.time(), self.category, level, msg, args))
+        if level < self.level:
+            return
+        if level == DEBUG and DEBUG_SAMPLE > 1:
+            self.sampled += 1
+            if self.sampled % DEBUG_SAMPLE:
+                return
+        if RATE_LIMIT and level < WARNING:
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                if self.suppressed:
+                    self.logger.info("%d messages suppressed (rate limit %d/s)", self.suppressed, RATE_LIMIT)
+                self.window_start = now
+                self.window_count = 0
+                self.suppressed = 0
+            if self.window_count >= RATE_LIMIT:
+                self.suppressed += 1
+                return
+            self.window_count += 1
+        self.logger.log(level, msg, *args)
+
+
+_LOGS = {}
+
+
+def get_log(category):
+    log = _LOGS.get(category)
+    if log is None:
+        log = _LOGS[category] = GameLog(category)
+    return log
+
+
+def format_record(record):
+    created, category, level, msg, args = record
+    try:
+        text = msg % args if args else msg
+    except (TypeError, ValueError):
+        text = f"{msg} {args}"
+    stamp = time.strftime("%H:%M:%S", time.localtime(created))
+    return f"{stamp}.{int(created % 1 * 1000):03d} [{category}] {logging.getLevelName(level)} {text}"
+
+
+def dump_ring(limit=None):
+    """Retourne les derniers messages du ring (les plus anciens d'abord), mis en forme."""
+    if RING is None:
+        return []
+    records = list(RING)
+    if limit is not None:
+        records = records[-limit:]
+    return [format_record(record) for record in records]
+
+
+def _dump_on_signal(signum, frame):
+    lines = dump_ring()
+    sys.stdout.write(f"[game.engine] ring dump ({len(lines)} messages)\n")
+    sys.stdout.write("".join(line + "\n" for line in lines))
+    sys.stdout.flush()
+
+
+def install_dump_signal():
+    """SIGUSR1 -> écrit le ring sur stdout. Appelé depuis GameConfig.ready() (thread principal uniquement)."""
+    if RING is None or not hasattr(signal, 'SIGUSR1'):
+        return
+    if threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(signal.SIGUSR1, _dump_on_signal)
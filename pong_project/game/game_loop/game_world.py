@@ -0,0 +1,160 @@
+# game/game_loop/game_world.py
+
+from .redis_utils import StateBatch
+from .state_codec import StateEncoder
+from .timers import GameTimers
+from .placement import SpawnPlacement
+from .tick_metrics import game_metrics
+
+INITIAL_PADDLE_HEIGHTS = {1: 60, 2: 80, 3: 100}
+INITIAL_BALL_SPEEDS = {1: 3, 2: 5, 3: 8}
+
+# Nombre de ticks entre deux snapshots de l'état dans Redis (~2 par seconde à 90 Hz)
+SNAPSHOT_INTERVAL = 45
+
+EFFECT_FLAGS = [
+    "paddle_left_sticky", "paddle_right_sticky",
+    "paddle_left_inverted", "paddle_right_inverted",
+    "paddle_left_ice_effect", "paddle_right_ice_effect",
+    "paddle_left_speed_boost", "paddle_right_speed_boost",
+    "flash_effect"
+]
+
+
+class GameWorld:
+    """
+    État de référence d'UNE partie pendant le match.
+    La boucle de jeu lit et écrit uniquement cet objet ; Redis ne reçoit que des
+    snapshots périodiques et ne sert plus qu'à transmettre les inputs des joueurs.
+    Chaque tick partage un StateBatch : un HGETALL au début, un pipeline à la fin.
+    """
+    def __init__(self, game_id, parameters, paddle_left, paddle_right, ball, powerup_orbs, bumpers):
+        self.game_id = game_id
+        self.parameters = parameters
+        self.paddle_left = paddle_left
+        self.paddle_right = paddle_right
+        self.ball = ball
+        self.powerup_orbs = powerup_orbs
+        self.bumpers = bumpers
+
+        self.initial_paddle_height = INITIAL_PADDLE_HEIGHTS[parameters.paddle_size]
+        self.initial_ball_speed_multiplier = INITIAL_BALL_SPEEDS[parameters.ball_speed]
+        paddle_left.height = self.initial_paddle_height
+        paddle_right.height = self.initial_paddle_height
+
+        self.score_left = 0
+        self.score_right = 0
+        self.paddle_velocity = {'left': 0.0, 'right': 0.0}
+
+        self.effects = set()
+        self.paddle_original_height = {}
+
+        self.ball_stuck = False
+        self.ball_stuck_side = None
+        self.sticky_relative_pos = 0
+
+        self.tick = 0
+        self.timers = GameTimers(lambda: self.tick)
+        # Prochaine tentative d'apparition (tick) ; None tant que le compte à rebours n'est pas armé
+        self.next_powerup_spawn_tick = None
+        self.next_bumper_spawn_tick = None
+        self.placement = SpawnPlacement(game_id)
+        self.last_snapshot_tick = 0
+        self.batch = StateBatch(game_id)
+        self.state_encoder = StateEncoder()
+        self.events = []   # événements du tick, envoyés avec le game_state (voir flush_tick)
+        self.metrics = game_metrics(game_id)   # durées des phases du tick (voir tick_metrics.py)
+
+    def get_paddle(self, side):
+        return self.paddle_left if side == 'left' else self.paddle_right
+
+    def has_effect(self, name):
+        return name in self.effects
+
+    def add_effect(self, name):
+        self.effects.add(name)
+        paddle, effect = self.paddle_effect(name)
+        if paddle is not None:
+            paddle.modifiers.push(effect)
+
+    def remove_effect(self, name):
+        self.effects.discard(name)
+        paddle, effect = self.paddle_effect(name)
+        if paddle is not None:
+            paddle.modifiers.remove(effect)
+
+    def clear_effects(self):
+        self.effects.clear()
+        self.paddle_left.modifiers.clear()
+        self.paddle_right.modifiers.clear()
+
+    def paddle_effect(self, name):
+        """'paddle_left_ice_effect' -> (raquette gauche, 'ice_effect') ; (None, None) pour un effet global."""
+        if not name.startswith("paddle_"):
+            return None, None
+        side, effect = name[len("paddle_"):].split("_", 1)
+        return self.get_paddle(side), effect
+
+    def queue_event(self, event):
+        self.events.append(event)
+
+    async def begin_tick(self, batch=None):
+        """
+        Charge le hash de la partie (HGETALL) et applique les inputs des joueurs.
+        <batch> : StateBatch déjà chargé par le scheduler partagé (voir load_batches).
+        """
+        self.batch = batch if batch is not None else await StateBatch(self.game_id).load()
+        self.paddle_velocity['left'] = float(self.batch.get("paddle_left_velocity") or 0)
+        self.paddle_velocity['right'] = float(self.batch.get("paddle_right_velocity") or 0)
+        if self.batch.get("resync") is not None:
+            self.batch.delete("resync")
+            self.state_encoder.request_keyframe()
+
+    async def end_tick(self, flush=True):
+        """
+        Ajoute le snapshot si nécessaire puis envoie toutes les écritures du tick.
+        flush=False : les écritures restent dans self.batch (envoyées par flush_batches).
+        """
+        if self.tick - self.last_snapshot_tick >= SNAPSHOT_INTERVAL:
+            self.batch.update(self.snapshot())
+            self.last_snapshot_tick = self.tick
+        if flush:
+            await self.batch.flush()
+
+    def snapshot(self):
+        """Retourne l'état courant sous forme de clés Redis (même nommage qu'avant)."""
+        ball = self.ball
+        data = {
+            "ball_x": ball.x,
+            "ball_y": ball.y,
+            "ball_vx": ball.speed_x,
+            "ball_vy": ball.speed_y,
+            "ball_stuck": int(self.ball_stuck),
+            "paddle_left_y": self.paddle_left.y,
+            "paddle_right_y": self.paddle_right.y,
+            "paddle_left_height": self.paddle_left.height,
+            "paddle_right_height": self.paddle_right.height,
+            "initial_paddle_height": self.initial_paddle_height,
+            "initial_ball_speed_multiplier": self.initial_ball_speed_multiplier,
+            "score_left": self.score_left,
+            "score_right": self.score_right,
+        }
+        for flag in EFFECT_FLAGS:
+            data[flag] = int(flag in self.effects)
+        for powerup_orb in self.powerup_orbs:
+            data[f"powerup_{powerup_orb.id}_active"] = int(powerup_orb.active)
+            if powerup_orb.active:
+                data[f"powerup_{powerup_orb.id}_x"] = powerup_orb.x
+                data[f"powerup_{powerup_orb.id}_y"] = powerup_orb.y
+        for bumper in self.bumpers:
+            data[f"bumper_{bumper.id}_active"] = int(bumper.active)
+            if bumper.active:
+                data[f"bumper_{bumper.id}_x"] = bumper.x
+                data[f"bumper_{bumper.id}_y"] = bumper.y
+        return data
+
+    async def save_snapshot(self):
+        """Écrit immédiatement le snapshot dans Redis (un seul pipeline)."""
+        self.batch.update(self.snapshot())
+        self.last_snapshot_tick = self.tick
+        await self.batch.flush()
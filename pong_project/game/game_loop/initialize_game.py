@@ -1,6 +1,6 @@
 
 
-from .redis_utils import set_key
+from .redis_utils import delete_state
 from ..game_objects import Paddle, Ball, PowerUpOrb, Bumper
 from .dimensions_utils import get_terrain_rect
 import random
@@ -38,42 +38,27 @@ def initialize_game_objects(game_id, parameters):
     ball = Ball(center_x, center_y, initial_ball_speed_x, initial_ball_speed_y)
 
     
+    # Identifiants stables dans la partie : index dans powerup_orbs / bumpers
     powerup_orbs = [
-        PowerUpOrb(game_id, 'invert', terrain_rect, color=(255, 105, 180)),
-        PowerUpOrb(game_id, 'shrink', terrain_rect, color=(255, 0, 0)),
-        PowerUpOrb(game_id, 'ice', terrain_rect, color=(0, 255, 255)),
-        PowerUpOrb(game_id, 'speed', terrain_rect, color=(255, 215, 0)),
-        PowerUpOrb(game_id, 'flash', terrain_rect, color=(255, 255, 0)),
-        PowerUpOrb(game_id, 'sticky', terrain_rect, color=(50, 205, 50))
+        PowerUpOrb(game_id, 0, 'invert', color=(255, 105, 180)),
+        PowerUpOrb(game_id, 1, 'shrink', color=(255, 0, 0)),
+        PowerUpOrb(game_id, 2, 'ice', color=(0, 255, 255)),
+        PowerUpOrb(game_id, 3, 'speed', color=(255, 215, 0)),
+        PowerUpOrb(game_id, 4, 'flash', color=(255, 255, 0)),
+        PowerUpOrb(game_id, 5, 'sticky', color=(50, 205, 50))
     ]
     bumpers = []
     if parameters.obstacles_enabled:
-        bumpers = [Bumper(game_id, terrain_rect) for _ in range(3)]
+        bumpers = [Bumper(game_id, object_id) for object_id in range(3)]
 
     return paddle_left, paddle_right, ball, powerup_orbs, bumpers
 
 
-def initialize_redis(game_id, paddle_left, paddle_right, ball, parameters):
-    
-    set_key(game_id, "paddle_left_y", paddle_left.y)
-    set_key(game_id, "paddle_right_y", paddle_right.y)
-
-    
-    set_key(game_id, "paddle_left_velocity", 0)
-    set_key(game_id, "paddle_right_velocity", 0)
-
-    
-    initial_height = {1: 60, 2: 80, 3: 100}[parameters.paddle_size]
-    set_key(game_id, "initial_paddle_height", initial_height)
-    set_key(game_id, "paddle_left_height", initial_height)
-    set_key(game_id, "paddle_right_height", initial_height)
-
-    
-    set_key(game_id, "ball_x", ball.x)
-    set_key(game_id, "ball_y", ball.y)
-    set_key(game_id, "ball_vx", ball.speed_x)
-    set_key(game_id, "ball_vy", ball.speed_y)
-
-    
-    initial_speed = {1: 3, 2: 5, 3: 8}[parameters.ball_speed]
-    set_key(game_id, "initial_ball_speed_multiplier", initial_speed)
\ No newline at end of file
+async def initialize_redis(world):
+    """Repart d'un hash vide, remet à zéro les inputs et écrit le premier snapshot."""
+    await delete_state(world.game_id)
+    world.batch.update({
+        "paddle_left_velocity": 0,
+        "paddle_right_velocity": 0,
+    })
+    await world.save_snapshot()
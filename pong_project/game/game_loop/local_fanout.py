@@ -0,0 +1,116 @@
+# game/game_loop/local_fanout.py
+
+import os
+import socket
+import time
+import uuid
+from django.conf import settings
+from .redis_utils import r, timed
+
+# Livraison directe des frames aux consumers du même process, sans passer par Redis
+LOCAL_FANOUT_ENABLED = settings.GAME_LOCAL_FANOUT
+
+# Délai entre deux vérifications de la présence de consumers dans d'autres process
+REMOTE_CHECK_TTL = settings.GAME_FANOUT_REMOTE_CHECK_TTL
+
+# Les entrées d'un process mort finissent par disparaître
+CONNECTIONS_TTL = 3600
+
+# Identifie ce process dans {game_id}:connections et dans les frames envoyées par Redis
+PROCESS_TAG = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+LOCAL_CONSUMERS = {}   # { game_id -> { channel_name -> FrameMailbox } }
+
+# Compteurs des connexions fermées, pour que les totaux du process ne reculent pas
+CLOSED_TOTALS = {'frames_received': 0, 'frames_sent': 0, 'frames_dropped': 0, 'events_sent': 0}
+_REMOTE_CACHE = {}     # { game_id -> (consumers distants ?, horodatage monotonic) }
+
+
+def connections_key(game_id):
+    return f"{game_id}:connections"
+
+
+async def register_consumer(game_id, channel_name, mailbox):
+    """
+    Inscrit un consumer de ce process pour une partie : la boucle de jeu dépose
+    ses messages directement dans sa FrameMailbox. Le process est aussi noté dans
+    Redis pour que les moteurs des autres process sachent qu'ils doivent passer
+    par le channel layer.
+    """
+    LOCAL_CONSUMERS.setdefault(str(game_id), {})[channel_name] = mailbox
+    pipe = r.pipeline(transaction=False)
+    pipe.hset(connections_key(game_id), channel_name, PROCESS_TAG)
+    pipe.expire(connections_key(game_id), CONNECTIONS_TTL)
+    await timed('register_consumer', pipe.execute())
+
+
+async def unregister_consumer(game_id, channel_name):
+    consumers = LOCAL_CONSUMERS.get(str(game_id))
+    if consumers is not None:
+        mailbox = consumers.pop(channel_name, None)
+        if mailbox is not None:
+            stats = mailbox.stats()
+            for key in CLOSED_TOTALS:
+                CLOSED_TOTALS[key] += stats[key]
+        if not consumers:
+            LOCAL_CONSUMERS.pop(str(game_id), None)
+    await timed('hdel', r.hdel(connections_key(game_id), channel_name))
+
+
+def is_local_consumer(game_id, channel_name):
+    return channel_name in LOCAL_CONSUMERS.get(str(game_id), {})
+
+
+async def has_remote_consumers(game_id):
+    """Vrai si un consumer de la partie vit dans un autre process (relu au plus une fois par TTL)."""
+    game_id = str(game_id)
+    entry = _REMOTE_CACHE.get(game_id)
+    now = time.monotonic()
+    if entry is not None and now - entry[1] <= REMOTE_CHECK_TTL:
+        return entry[0]
+    tags = await timed('hvals', r.hvals(connections_key(game_id)))
+    remote = any(tag.decode('utf-8') != PROCESS_TAG for tag in tags)
+    _REMOTE_CACHE[game_id] = (remote, now)
+    return remote
+
+
+def get_connection_stats(game_id=None):
+    """Compteurs des connexions de ce process (frames envoyées / écrasées...), par partie puis par canal."""
+    if game_id is not None:
+        consumers = LOCAL_CONSUMERS.get(str(game_id), {})
+        return {channel_name: mailbox.stats() for channel_name, mailbox in list(consumers.items())}
+    return {gid: get_connection_stats(gid) for gid in list(LOCAL_CONSUMERS)}
+
+
+def get_connection_totals():
+    """Compteurs de toutes les connexions du process depuis son démarrage, sans identifiant de partie."""
+    totals = dict(CLOSED_TOTALS, connections=0, pending_events=0)
+    for consumers in list(LOCAL_CONSUMERS.values()):
+        for mailbox in list(consumers.values()):
+            stats = mailbox.stats()
+            for key in CLOSED_TOTALS:
+                totals[key] += stats[key]
+            totals['connections'] += 1
+            totals['pending_events'] += stats['pending_events']
+    return totals
+
+
+def forget_game(game_id):
+    _REMOTE_CACHE.pop(str(game_id), None)
+
+
+async def publish(channel_layer, game_id, message):
+    """
+    Envoie <message> à tous les consumers de la partie :
+    directement dans la file des consumers locaux, et par le channel layer
+    seulement si d'autres process ont des consumers (ils ignorent alors la
+    copie marquée de leur propre process, déjà reçue en local).
+    """
+    if not LOCAL_FANOUT_ENABLED:
+        await channel_layer.group_send(f"pong_{game_id}", message)
+        return
+
+    for mailbox in LOCAL_CONSUMERS.get(str(game_id), {}).values():
+        mailbox.put_nowait(message)
+    if await has_remote_consumers(game_id):
+        await channel_layer.group_send(f"pong_{game_id}", dict(message, origin=PROCESS_TAG))
@@ -6,40 +6,68 @@ import time
 from django.conf import settings
 from channels.layers import get_channel_layer
 
-from .redis_utils import get_key
 from .models_utils import get_gameSession_status, get_gameSession, is_online_gameSession, get_gameSession_parameters, set_gameSession_status
 from .initialize_game import initialize_game_objects, initialize_redis
-from .paddles_utils import move_paddles
-from .ball_utils import move_ball, move_ball_sticky, reset_ball
-from .collisions import (
-    handle_scoring_or_paddle_collision,
-    
-    handle_border_collisions,
-    handle_bumper_collision,
-    handle_powerup_collision
+from .game_world import GameWorld
+from .scheduler import (
+    FixedTimestepClock,
+    SHARED_SCHEDULER,
+    register_clock,
+    unregister_clock,
+    get_tick_stats
 )
+from .physics import simulate_step
+from .ball_utils import reset_ball
 from .score_utils import handle_score, winner_detected, finish_game, reset_all_objects
-from .bumpers_utils import handle_bumpers_spawn, handle_bumper_expiration
-from .powerups_utils import handle_powerups_spawn, handle_powerup_expiration
-from .broadcast import broadcast_game_state, notify_countdown, notify_scored, notify_game_aborted
+from .bumpers_utils import handle_bumpers_spawn
+from .powerups_utils import handle_powerups_spawn
+from .local_fanout import forget_game
+from .readiness import READY_FALLBACK_POLL, watch_ready, unwatch_ready
+from .broadcast import flush_tick, notify_countdown, notify_scored, notify_game_aborted
+from .tick_metrics import record, ensure_lag_monitor, forget_game_metrics, get_phase_stats
+from .game_log import get_log
+
+log = get_log('loop')
+
+# 'per_game' : une tâche asyncio par partie ; 'shared' : un seul scheduler pour toutes
+ENGINE_MODE = settings.GAME_ENGINE_MODE
+
+# Pause après un but avant la remise en jeu (secondes)
+GOAL_PAUSE = 1.5
+
+# Ticks de simulation entre deux game_state (GAME_TICK_RATE / GAME_BROADCAST_RATE, au moins 1)
+BROADCAST_INTERVAL = max(1.0, settings.GAME_TICK_RATE / settings.GAME_BROADCAST_RATE)
 
 class WaitForPlayersTimeout(Exception):
     """Exception levée lorsqu'un délai d'attente est dépassé avant que les joueurs ne soient prêts."""
     pass
 
 async def wait_for_players(game_id):
-    print(f"[game_loop.py] wait_for_players {game_id}.")
+    """
+    Attend que ready_left et ready_right soient à True.
+    Les vues signalent chaque joueur prêt (pub/sub, voir readiness.py) : la base n'est
+    relue qu'à ces signaux, et au plus toutes les READY_FALLBACK_POLL s sinon.
+    """
+    log.info("wait_for_players %s.", game_id)
     timeout = 30  
-    start_time = time.time()
-    
-    
-    while time.time() - start_time < timeout:
-        gs = await get_gameSession(game_id)
-        if gs.ready_left and gs.ready_right:
-            print(f"[game_loop.py] wait_for_players Everyone is READY {game_id}.")
-            return True
-        await asyncio.sleep(0.1)  
-    
+    deadline = time.monotonic() + timeout
+    ready = watch_ready(game_id)
+    try:
+        while True:
+            ready.clear()
+            gs = await get_gameSession(game_id)
+            if gs.ready_left and gs.ready_right:
+                log.info("wait_for_players Everyone is READY %s.", game_id)
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(ready.wait(), min(READY_FALLBACK_POLL, remaining))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        unwatch_ready(game_id)
     
     raise WaitForPlayersTimeout(f"Délai d'attente de {timeout} secondes dépassé pour game_id {game_id}.")
 
@@ -53,105 +81,197 @@ async def countdown_before_game(game_id):
 
 
 
+class GameRunner:
+    """
+    Déroulé d'UNE partie après le compte à rebours, tick par tick.
+    Sert à la fois à la boucle dédiée (mode 'per_game') et au SharedScheduler.
+    La pause après un but est un état (paused_until) : un tick ne dort jamais.
+    """
+    def __init__(self, world, channel_layer):
+        self.game_id = world.game_id
+        self.world = world
+        self.channel_layer = channel_layer
+        self.paused_until = None
+        self.pending_scorer = None
+        self.finished = False   # True si un vainqueur a été détecté
+        self.stopped = False    # True quand la boucle doit s'arrêter
+        self.now = None
+        self.next_broadcast_tick = 0.0
+        self.done = None        # future posé par le SharedScheduler
+
+    def is_paused(self, now):
+        return self.paused_until is not None and now < self.paused_until
+
+    async def prepare(self, now, batch=None):
+        """
+        Début de tick : statut, fin de la pause après un but, inputs des joueurs.
+        Retourne True s'il faut simuler ce tick ; self.stopped passe à True si la partie s'arrête.
+        """
+        world = self.world
+        metrics = world.metrics
+        started = time.perf_counter()
+
+        session_status = await get_gameSession_status(self.game_id)
+        if session_status != 'running':
+            log.info("game_id=%s => statut=%s. Fin de la boucle.", self.game_id, session_status)
+            self.stopped = True
+            return False
+
+        if self.pending_scorer is not None:
+            if self.is_paused(now):
+                return False
+            scoring_started = time.perf_counter()
+            scorer = self.pending_scorer
+            self.pending_scorer = None
+            self.paused_until = None
+            handle_score(world, scorer)
+            await world.save_snapshot()
+
+            if winner_detected(world):
+                record(metrics, 'scoring', scoring_started)
+                self.finished = True
+                self.stopped = True
+                return False
+            reset_ball(world)
+            # Le but est compté dans 'scoring', pas dans 'input'
+            started += record(metrics, 'scoring', scoring_started) - scoring_started
+
+        self.now = now
+        await world.begin_tick(batch)
+        record(metrics, 'input', started)
+        return True
+
+    async def simulate(self, steps):
+        """Avance la physique de <steps> pas ; retourne le scorer éventuel."""
+        scorer = None
+        for _ in range(steps):
+            scorer = await simulate_step(self.world)
+            if scorer:
+                break
+        return scorer
+
+    async def complete(self, scorer, flush=True):
+        """Fin de tick : but, apparitions/expirations, broadcast et écriture Redis."""
+        world = self.world
+        parameters = world.parameters
+        metrics = world.metrics
+        started = time.perf_counter()
+
+        if scorer in ['score_left', 'score_right']:
+            await reset_all_objects(world)
+            await notify_scored(world)
+            started = record(metrics, 'scoring', started)
+            await flush_tick(world, self.channel_layer, send_state=False)
+            started = record(metrics, 'broadcast', started)
+            self.pending_scorer = scorer
+            self.paused_until = self.now + GOAL_PAUSE
+            await world.end_tick(flush)
+            record(metrics, 'flush', started)
+            return
+
+        # Fins d'effets, cooldowns, expirations d'orbes/bumpers et balle collée
+        await world.timers.run_due()
+
+        if parameters.bonus_enabled:
+            await handle_powerups_spawn(world)
+
+        if parameters.obstacles_enabled:
+            await handle_bumpers_spawn(world)
+        started = record(metrics, 'spawn', started)
+
+        await flush_tick(world, self.channel_layer, send_state=self.broadcast_due())
+        started = record(metrics, 'broadcast', started)
+
+        await world.end_tick(flush)
+        record(metrics, 'flush', started)
+
+    def broadcast_due(self):
+        """
+        True si un game_state doit partir à ce tick (cadence GAME_BROADCAST_RATE).
+        Les événements (collisions, points, power-ups) partent à chaque tick, avec ou sans état.
+        """
+        tick = self.world.tick
+        if tick < self.next_broadcast_tick:
+            return False
+        self.next_broadcast_tick += BROADCAST_INTERVAL
+        if self.next_broadcast_tick <= tick:
+            self.next_broadcast_tick = tick + BROADCAST_INTERVAL
+        return True
+
+    async def tick(self, steps, now, batch=None, flush=True):
+        """
+        Un tick complet avec la physique scalaire.
+        Retourne True quand la partie doit s'arrêter (statut changé ou vainqueur).
+        """
+        started = time.perf_counter()
+        if await self.prepare(now, batch):
+            scorer = await self.simulate(steps)
+            await self.complete(scorer, flush)
+            record(self.world.metrics, 'tick', started)
+        return self.stopped
+
+
+async def run_dedicated_loop(runner):
+    """Mode 'per_game' : une tâche et une horloge par partie."""
+    clock = FixedTimestepClock()
+    register_clock(runner.game_id, clock)
+    clock.start()
+    while True:
+        steps = await clock.wait_next()
+        if await runner.tick(steps, time.monotonic()):
+            return
+        if runner.paused_until is not None:
+            await clock.pause_for(runner.paused_until - time.monotonic())
+
+
 async def game_loop(game_id):
     """
     Boucle principale pour UNE partie identifiée par game_id.
-    Tourne ~90 fois/s tant que la partie n'est pas 'finished'.
+    Tourne à GAME_TICK_RATE ticks/s tant que la partie est 'running', soit dans sa
+    propre boucle, soit inscrite au scheduler partagé (GAME_ENGINE_MODE='shared').
     """
     channel_layer = get_channel_layer()
-    dt = 1/90
-    print(f"[game_loop.py] Starting loop for game_id={game_id}.")
+    log.info("Starting loop for game_id=%s.", game_id)
+    ensure_lag_monitor()
     try:
         await wait_for_players(game_id)
-        
-        parameters = await get_gameSession_parameters(game_id)
 
+        parameters = await get_gameSession_parameters(game_id)
 
-        
-        paddle_left, paddle_right, ball, powerup_orbs, bumpers = initialize_game_objects(game_id, parameters)
-        initialize_redis(game_id, paddle_left, paddle_right, ball, parameters)
+        world = GameWorld(game_id, parameters, *initialize_game_objects(game_id, parameters))
+        await initialize_redis(world)
         await countdown_before_game(game_id)
-        
 
-        
-        
-        
-        
-        while True:
-            
-            try :
-                
-                session_status = await get_gameSession_status(game_id)
-                if session_status != 'running':
-                    print(f"[game_loop] game_id={game_id} => statut={session_status}. Fin de la boucle.")
-                    break
-
-                current_time = time.time()
-
-                
-                move_paddles(game_id, paddle_left, paddle_right)
-
-                
-                stuck_flag = get_key(game_id, "ball_stuck")
-                if stuck_flag and stuck_flag.decode('utf-8') == '1':
-                    move_ball_sticky(game_id, paddle_left, paddle_right, ball)
-                else :
-                    move_ball(game_id, ball)
-                
-                
-                await handle_border_collisions(game_id, ball)
-                await handle_bumper_collision(game_id, ball, bumpers)
-                await handle_powerup_collision(game_id, ball, powerup_orbs)
-                
-
-                
-                scorer = await handle_scoring_or_paddle_collision(game_id, paddle_left, paddle_right, ball)
-                if scorer in ['score_left', 'score_right']:
-                    await reset_all_objects(game_id, powerup_orbs, bumpers) 
-                    await notify_scored(game_id)
-                    await asyncio.sleep(1.5)
-                    handle_score(game_id, scorer)
-
-                    
-                    if winner_detected(game_id):
-                        await finish_game(game_id)
-                        break
-                    else:
-                        
-                        reset_ball(game_id, ball)
-
-                
-                
-                if parameters.bonus_enabled:
-                    await handle_powerups_spawn(game_id, powerup_orbs, current_time, bumpers)
-                    await handle_powerup_expiration(game_id, powerup_orbs)
-
-                if parameters.obstacles_enabled:
-                    await handle_bumpers_spawn(game_id, bumpers, current_time, powerup_orbs)
-                    await handle_bumper_expiration(game_id, bumpers)
-                
-                
-                
-                
-                await broadcast_game_state(game_id, channel_layer, paddle_left, paddle_right, ball, powerup_orbs, bumpers)
-
-                
-                
-                await asyncio.sleep(dt)
-            except asyncio.CancelledError:
-                await set_gameSession_status(game_id, "cancelled")
-                await notify_game_aborted(game_id)
-                return
+        runner = GameRunner(world, channel_layer)
+        if ENGINE_MODE == 'shared':
+            await SHARED_SCHEDULER.run_game(runner)
+        else:
+            await run_dedicated_loop(runner)
+
+        if runner.finished:
+            await finish_game(world)
 
     except asyncio.CancelledError:
-        print(f"[game_loop] => CANCELLED => on arrête la game {game_id}")
+        log.info("CANCELLED => on arrête la game %s", game_id)
         
         await set_gameSession_status(game_id, "cancelled")
         await notify_game_aborted(game_id)
         return  
     
     except Exception as e:
-        print(f"[game_loop] Exception pour game_id={game_id} : {e}")
+        log.error("Exception pour game_id=%s : %s", game_id, e)
 
     finally:
-        print(f"[game_loop] Fin du game_loop pour game_id={game_id}.")
\ No newline at end of file
+        tick_stats = get_tick_stats(game_id)
+        if tick_stats is not None:
+            log.info("Cadence game_id=%s : %s", game_id, tick_stats)
+        phase_stats = get_phase_stats(game_id)
+        if phase_stats:
+            log.info("Phases game_id=%s : %s", game_id, {
+                phase: {q: round(value * 1e6, 1) for q, value in stats['quantiles'].items()}
+                for phase, stats in phase_stats.items()
+            })
+        unregister_clock(game_id)
+        forget_game_metrics(game_id)
+        forget_game(game_id)
+        log.info("Fin du game_loop pour game_id=%s.", game_id)
@@ -0,0 +1,89 @@
+# game/game_loop/mailbox.py
+
+import asyncio
+from collections import deque
+
+
+class FrameMailbox:
+    """
+    Boîte aux lettres d'UNE connexion WebSocket, entre la boucle de jeu et l'envoi réseau.
+    put_nowait() ne bloque jamais : un client lent ne retient ni la boucle de jeu ni le
+    channel layer, et sa mémoire reste bornée.
+    - événements : tous conservés et envoyés dans l'ordre ;
+    - game_state : remplaçable, seul le plus récent non envoyé est gardé (les autres sont
+      comptés dans frames_dropped) ;
+    - contrôle (countdown, game_over, game_aborted) : jamais écrasé, envoyé après tout ce qui
+      a été déposé avant lui ; le game_state en attente passe donc dans la file avant lui.
+    La file contient des paires (genre, contenu) : 'event', 'state' ou 'control'.
+    """
+    def __init__(self):
+        self.events = deque()
+        self.state = None
+        self.dropped_since_take = False
+        self.wakeup = asyncio.Event()
+
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.frames_sent = 0
+        self.events_sent = 0
+        self.max_pending_events = 0
+
+    def put_nowait(self, message):
+        """Dépose un message game_tick (voir flush_tick)."""
+        if 'events' in message:
+            self.events.append(('event', message['events']))
+            self.max_pending_events = max(self.max_pending_events, len(self.events))
+        if 'text' in message or 'frame' in message:
+            self.frames_received += 1
+            if self.state is not None:
+                self.frames_dropped += 1
+                self.dropped_since_take = True
+            self.state = message
+        self.wakeup.set()
+
+    def put_control(self, text):
+        """Dépose un message de contrôle déjà encodé en JSON."""
+        if self.state is not None:
+            self.events.append(('state', (self.state, self.dropped_since_take)))
+            self.state = None
+            self.dropped_since_take = False
+        self.events.append(('control', text))
+        self.wakeup.set()
+
+    async def take(self):
+        """
+        Attend du contenu puis retourne (file (genre, contenu) à envoyer dans l'ordre,
+        dernier game_state ou None, True si des game_state ont été écrasés depuis le précédent take()).
+        """
+        while not self.events and self.state is None:
+            self.wakeup.clear()
+            await self.wakeup.wait()
+        events = list(self.events)
+        self.events.clear()
+        state = self.state
+        dropped = self.dropped_since_take
+        self.state = None
+        self.dropped_since_take = False
+        for kind, _ in events:
+            if kind == 'event':
+                self.events_sent += 1
+            elif kind == 'state':
+                self.frames_sent += 1
+        if state is not None:
+            self.frames_sent += 1
+        return events, state, dropped
+
+    def drop_taken_state(self):
+        """Le game_state rendu par take() n'a finalement pas été envoyé (delta sans base côté client)."""
+        self.frames_sent -= 1
+        self.frames_dropped += 1
+
+    def stats(self):
+        return {
+            'frames_received': self.frames_received,
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'events_sent': self.events_sent,
+            'pending_events': len(self.events),
+            'max_pending_events': self.max_pending_events,
+        }
@@ -1,6 +1,10 @@
 
 from django.apps import apps  
-from asgiref.sync import sync_to_async
+from .db_executor import run_db
+from .status_cache import get_cached_status, set_cached_status
+from .game_log import get_log
+
+log = get_log('db')
 
 class GameSessionNotFound(Exception):
     """Exception personnalisée pour le cas où la session n'existe pas."""
@@ -14,14 +18,18 @@ async def get_gameSession(game_id):
     
     GameSession = apps.get_model('game', 'GameSession')
     try:
-        session = await sync_to_async(GameSession.objects.get)(pk=game_id)
+        session = await run_db(GameSession.objects.get, pk=game_id)
         return session
     except GameSession.DoesNotExist as e:
         raise GameSessionNotFound(f"La GameSession avec l'ID {game_id} n'existe pas.") from e
 
 async def get_gameSession_status(game_id):
-    
+    """Statut de la session, lu dans le cache du process tant qu'il est valide."""
+    status = get_cached_status(game_id)
+    if status is not None:
+        return status
     session = await get_gameSession(game_id)
+    set_cached_status(game_id, session.status)
     return session.status
 
 async def is_online_gameSession(game_id):
@@ -32,23 +40,29 @@ async def is_online_gameSession(game_id):
 async def set_gameSession_status(game_id, status):
     
     GameSession = apps.get_model('game', 'GameSession')
-    try:
-        
-        session = await sync_to_async(
-            GameSession.objects.select_related('player_left', 'player_right').get
-        )(pk=game_id)
+
+    def update_status():
+        session = GameSession.objects.select_related('player_left', 'player_right').get(pk=game_id)
         session.status = status
-        await sync_to_async(session.save)()
+        session.save()
+        return session
+
+    try:
+        session = await run_db(update_status)
+        set_cached_status(game_id, status)
         return session
     except GameSession.DoesNotExist as e:
         raise GameSessionNotFound(f"La GameSession avec l'ID {game_id} n'existe pas.") from e
 
 async def get_gameSession_parameters(game_id):
     GameSession = apps.get_model('game', 'GameSession')
-    try:
-        session = await sync_to_async(GameSession.objects.get)(pk=game_id)
-        parameters = await sync_to_async(getattr)(session, 'parameters', None)
-    except parameters is None:
+
+    def fetch_parameters():
+        session = GameSession.objects.get(pk=game_id)
+        return getattr(session, 'parameters', None)
+
+    parameters = await run_db(fetch_parameters)
+    if parameters is None:
         raise GameParametersNotFound(f"La GameSession avec l'ID {game_id} n'a pas de paramètres définis.")
     return parameters
 
@@ -58,11 +72,11 @@ async def get_LocalTournament(game_id, phase):
     
     LocalTournament = apps.get_model('game', 'LocalTournament')
     if phase == "semifinal1":
-        tournament = await sync_to_async(LocalTournament.objects.filter(semifinal1__id=game_id).first)()
+        tournament = await run_db(LocalTournament.objects.filter(semifinal1__id=game_id).first)
     elif phase == "semifinal2":
-        tournament = await sync_to_async(LocalTournament.objects.filter(semifinal2__id=game_id).first)()
+        tournament = await run_db(LocalTournament.objects.filter(semifinal2__id=game_id).first)
     else:
-        tournament = await sync_to_async(LocalTournament.objects.filter(final__id=game_id).first)()
+        tournament = await run_db(LocalTournament.objects.filter(final__id=game_id).first)
     return tournament
 
 async def create_gameResults(game_id, gameSession_isOnline, endgame_infos):
@@ -71,16 +85,16 @@ async def create_gameResults(game_id, gameSession_isOnline, endgame_infos):
     GameResult = apps.get_model('game', 'GameResult')
 
     try:
-        print(f"[create_gameResults] Creating GameResult for game {game_id}...")
+        log.info("Creating GameResult for game %s...", game_id)
         
-        session = await sync_to_async(GameSession.objects.get)(pk=game_id)
+        session = await run_db(GameSession.objects.get, pk=game_id)
         if session.status == 'cancelled':
-            print("[create_gameResults] => The game was cancelled => skipping result creation.")
+            log.info("The game was cancelled => skipping result creation.")
             return
 
         
         def save_game_result():
-            print(f"[create_gameResults] GameResult CREATED")
+            log.info("GameResult CREATED for game %s", game_id)
             GameResult.objects.create(
                 game=session,
                 winner=endgame_infos['winner'],
@@ -92,9 +106,9 @@ async def create_gameResults(game_id, gameSession_isOnline, endgame_infos):
             )
 
         
-        await sync_to_async(save_game_result, thread_sensitive=True)()
+        await run_db(save_game_result)
 
     except GameSession.DoesNotExist:
-        print(f"[create_gameResults] GameSession {game_id} does not exist.")
+        log.warning("GameSession %s does not exist.", game_id)
     except Exception as e:
-        print(f"[create_gameResults] Error creating GameResult: {e}")
\ No newline at end of file
+        log.error("Error creating GameResult: %s", e)
\ No newline at end of file
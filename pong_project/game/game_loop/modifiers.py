@@ -0,0 +1,70 @@
+# game/game_loop/modifiers.py
+
+SPEED_BOOST = 1.5
+
+# Contribution de chaque effet de raquette (flag paddle_<side>_<effet>) aux paramètres
+# de déplacement : les valeurs numériques se multiplient, les booléens se cumulent (ou).
+# Un nouveau power-up de raquette n'ajoute qu'une entrée ici, sans coût par tick.
+PADDLE_MODIFIERS = {
+    'inverted': {'direction': -1},
+    'speed_boost': {'speed': SPEED_BOOST},
+    'ice_effect': {'on_ice': True},
+    'sticky': {'sticky': True},
+}
+
+PADDLE_DEFAULTS = {'direction': 1, 'speed': 1, 'on_ice': False, 'sticky': False}
+
+
+class PaddleModifiers:
+    """
+    Pile des effets actifs sur UNE raquette.
+    Les paramètres (direction, speed, on_ice, sticky) sont recomposés à chaque début ou
+    fin d'effet ; move_paddles et les collisions ne font que les lire.
+    """
+    __slots__ = ('stack', 'direction', 'speed', 'on_ice', 'sticky')
+
+    def __init__(self):
+        self.stack = []
+        self.compose()
+
+    def push(self, name):
+        if name not in self.stack:
+            self.stack.append(name)
+            self.compose()
+
+    def remove(self, name):
+        if name in self.stack:
+            self.stack.remove(name)
+            self.compose()
+
+    def clear(self):
+        self.stack = []
+        self.compose()
+
+    def compose(self):
+        params = dict(PADDLE_DEFAULTS)
+        for name in self.stack:
+            for key, value in PADDLE_MODIFIERS[name].items():
+                if isinstance(value, bool):
+                    params[key] = params[key] or value
+                else:
+                    params[key] = params[key] * value
+        self.direction = params['direction']
+        self.speed = params['speed']
+        self.on_ice = params['on_ice']
+        self.sticky = params['sticky']
+
+
+class BallModifiers:
+    """
+    Effets en cours sur la balle :
+    - held_velocity : vitesse mise de côté pendant que la balle est collée (sticky) ;
+    - boosted_hit : le prochain renvoi de raquette double la vitesse (balle relâchée) ;
+    - restore_velocity : vitesse d'avant ce renvoi doublé, rétablie au renvoi suivant.
+    """
+    __slots__ = ('held_velocity', 'boosted_hit', 'restore_velocity')
+
+    def __init__(self):
+        self.held_velocity = None
+        self.boosted_hit = False
+        self.restore_velocity = None
@@ -0,0 +1,47 @@
+# game/game_loop/physics.py
+
+import time
+from .paddles_utils import move_paddles
+from .ball_utils import move_ball_sticky
+from .collisions import advance_ball, handle_scoring_or_paddle_collision
+from .tick_metrics import record
+
+
+async def simulate_step(world):
+    """
+    Un pas de simulation à pas fixe : raquettes, balle (collisions continues), points.
+    Retourne 'score_left', 'score_right' ou None.
+    """
+    metrics = world.metrics
+    started = time.perf_counter()
+    world.tick += 1
+    move_paddles(world)
+    started = record(metrics, 'paddles', started)
+
+    if world.ball_stuck:
+        move_ball_sticky(world)
+    else :
+        await advance_ball(world)
+    started = record(metrics, 'ball', started)
+
+    scorer = await handle_scoring_or_paddle_collision(world)
+    record(metrics, 'collisions', started)
+    return scorer
+
+
+class ScalarPhysics:
+    """Physique historique : simulate_step appelé partie par partie."""
+    name = 'scalar'
+
+    async def simulate(self, worlds, steps):
+        """Avance chaque partie de <steps> pas ; retourne la liste des scorers (ou None)."""
+        scorers = []
+        for world in worlds:
+            scorer = None
+            for _ in range(steps):
+                scorer = await simulate_step(world)
+                if scorer:
+                    break
+            scorers.append(scorer)
+        return scorers
+
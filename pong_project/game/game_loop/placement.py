@@ -0,0 +1,150 @@
+# game/game_loop/placement.py
+
+import math
+import random
+from .dimensions_utils import get_terrain_rect
+
+# Distance minimale entre deux objets actifs (orbes et bumpers confondus)
+MIN_OBJECT_DISTANCE = 40
+# Zones interdites autour du centre : bande verticale pour les orbes, disque pour les bumpers
+POWERUP_CENTER_GAP = 50
+BUMPER_CENTER_GAP = 30
+# Côté (approximatif) d'une cellule candidate
+CELL_SIZE = 10
+
+
+def spawn_area(terrain_rect):
+    """Zone d'apparition des orbes et bumpers : (left, right, top, bottom)."""
+    return (
+        terrain_rect['left'] + (terrain_rect['width'] * 0.25),
+        terrain_rect['left'] + (terrain_rect['width'] * 0.75),
+        terrain_rect['top'] + (terrain_rect['height'] * 0.1),
+        terrain_rect['top'] + (terrain_rect['height'] * 0.9)
+    )
+
+
+def rect_distance(x, y, x0, y0, x1, y1):
+    """Distance du point (x, y) au rectangle [x0, x1] x [y0, y1] (0 si le point est dedans)."""
+    dx = max(x0 - x, 0, x - x1)
+    dy = max(y0 - y, 0, y - y1)
+    return math.hypot(dx, dy)
+
+
+class FreeCellGrid:
+    """
+    Cellules candidates d'UN type d'objet. Une cellule est libre si TOUT point de la
+    cellule respecte les règles ; tirer une cellule libre puis un point dans la cellule
+    donne donc une position valide du premier coup.
+    - blocked[c] : nombre d'objets actifs trop proches de la cellule c ;
+    - free : cellules libres, retrait/ajout en O(1) (échange avec la dernière).
+    """
+    def __init__(self, area, cols, rows, forbidden):
+        self.left, self.top = area[0], area[2]
+        self.cols, self.rows = cols, rows
+        self.cell_w = (area[1] - area[0]) / cols
+        self.cell_h = (area[3] - area[2]) / rows
+        # Cellules interdites en permanence : forbidden(x0, y0, x1, y1) -> bool
+        self.excluded = [forbidden(*self.cell_bounds(c)) for c in range(cols * rows)]
+        self.blocked = [0] * (cols * rows)
+        self.free = [c for c in range(cols * rows) if not self.excluded[c]]
+        self.slot = [-1] * (cols * rows)
+        for i, c in enumerate(self.free):
+            self.slot[c] = i
+
+    def cell_bounds(self, c):
+        col, row = c % self.cols, c // self.cols
+        x0 = self.left + col * self.cell_w
+        y0 = self.top + row * self.cell_h
+        return x0, y0, x0 + self.cell_w, y0 + self.cell_h
+
+    def cells_near(self, x, y, radius):
+        """Cellules dont au moins un point est à moins de <radius> de (x, y)."""
+        cell_w, cell_h = self.cell_w, self.cell_h
+        col0 = max(0, int((x - radius - self.left) // cell_w))
+        col1 = min(self.cols - 1, int((x + radius - self.left) // cell_w))
+        row0 = max(0, int((y - radius - self.top) // cell_h))
+        row1 = min(self.rows - 1, int((y + radius - self.top) // cell_h))
+        limit = radius * radius
+        # Écart horizontal de chaque colonne au point (0 si le point est dans la colonne)
+        gaps_x = []
+        for col in range(col0, col1 + 1):
+            x0 = self.left + col * cell_w
+            gap = max(x0 - x, 0, x - x0 - cell_w)
+            gaps_x.append((col, gap * gap))
+        cells = []
+        for row in range(row0, row1 + 1):
+            y0 = self.top + row * cell_h
+            gap = max(y0 - y, 0, y - y0 - cell_h)
+            gap_y = gap * gap
+            base = row * self.cols
+            cells.extend(base + col for col, gap_x in gaps_x if gap_x + gap_y < limit)
+        return cells
+
+    def block(self, cells):
+        blocked, excluded = self.blocked, self.excluded
+        for c in cells:
+            blocked[c] += 1
+            if blocked[c] == 1 and not excluded[c]:
+                self._remove_free(c)
+
+    def unblock(self, cells):
+        blocked, excluded = self.blocked, self.excluded
+        for c in cells:
+            blocked[c] -= 1
+            if blocked[c] == 0 and not excluded[c]:
+                self.slot[c] = len(self.free)
+                self.free.append(c)
+
+    def _remove_free(self, c):
+        i = self.slot[c]
+        last = self.free.pop()
+        if last != c:
+            self.free[i] = last
+            self.slot[last] = i
+        self.slot[c] = -1
+
+    def sample(self, rng=random):
+        """Position valide tirée uniformément parmi les cellules libres, ou None si le terrain est plein."""
+        if not self.free:
+            return None
+        x0, y0, x1, y1 = self.cell_bounds(rng.choice(self.free))
+        return rng.uniform(x0, x1), rng.uniform(y0, y1)
+
+
+class SpawnPlacement:
+    """
+    Moteur de placement d'UNE partie : une grille de cellules libres par type d'objet,
+    mise à jour à chaque apparition (occupy) et disparition (release) d'un objet.
+    Tirer une position coûte O(1) ; occuper/libérer ne touche que les cellules proches.
+    """
+    def __init__(self, game_id):
+        terrain_rect = get_terrain_rect(game_id)
+        area = spawn_area(terrain_rect)
+        cols = max(1, int((area[1] - area[0]) // CELL_SIZE))
+        rows = max(1, int((area[3] - area[2]) // CELL_SIZE))
+        center_x = terrain_rect['left'] + (terrain_rect['width'] / 2)
+        center_y = terrain_rect['top'] + (terrain_rect['height'] / 2)
+
+        self.grids = {
+            'powerup': FreeCellGrid(area, cols, rows, lambda x0, y0, x1, y1:
+                                    x0 < center_x + POWERUP_CENTER_GAP and x1 > center_x - POWERUP_CENTER_GAP),
+            'bumper': FreeCellGrid(area, cols, rows, lambda x0, y0, x1, y1:
+                                   rect_distance(center_x, center_y, x0, y0, x1, y1) < BUMPER_CENTER_GAP),
+        }
+        self.occupied = {}   # { objet -> cellules bloquées par occupy }
+
+    def sample(self, kind):
+        return self.grids[kind].sample()
+
+    def occupy(self, obj):
+        # Les grilles partagent le même découpage : les cellules proches sont calculées une fois
+        cells = self.grids['powerup'].cells_near(obj.x, obj.y, MIN_OBJECT_DISTANCE)
+        self.occupied[obj] = cells
+        for grid in self.grids.values():
+            grid.block(cells)
+
+    def release(self, obj):
+        cells = self.occupied.pop(obj, None)
+        if cells is not None:
+            for grid in self.grids.values():
+                grid.unblock(cells)
@@ -0,0 +1,71 @@
+# game/game_loop/readiness.py
+
+import asyncio
+from asgiref.sync import async_to_sync
+from .redis_utils import r, timed
+from .game_log import get_log
+
+log = get_log('readiness')
+
+# Canal pub/sub sur lequel les vues signalent qu'un joueur s'est déclaré prêt
+READY_CHANNEL_PREFIX = "game_ready:"
+
+# Filet de sécurité : la boucle relit quand même la base à cet intervalle (s)
+# si aucun signal n'arrive (message pub/sub perdu, vue d'une version précédente...)
+READY_FALLBACK_POLL = 2.0
+
+READY_EVENTS = {}   # { game_id -> asyncio.Event } des parties en attente dans ce process
+_listener = None    # tâche unique qui écoute game_ready:* pour tout le process
+
+
+def ready_channel(game_id):
+    return f"{READY_CHANNEL_PREFIX}{game_id}"
+
+
+async def listen_ready():
+    """Une seule souscription (PSUBSCRIBE game_ready:*) réveille toutes les parties en attente."""
+    pubsub = r.pubsub()
+    try:
+        await pubsub.psubscribe(f"{READY_CHANNEL_PREFIX}*")
+        async for message in pubsub.listen():
+            if message.get('type') != 'pmessage':
+                continue
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode('utf-8')
+            event = READY_EVENTS.get(channel[len(READY_CHANNEL_PREFIX):])
+            if event is not None:
+                event.set()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        log.warning("Ready listener stopped: %s", e)
+    finally:
+        await pubsub.close()
+
+
+def watch_ready(game_id):
+    """Retourne l'événement posé à chaque signal 'prêt' de la partie (démarre l'écoute si besoin)."""
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.get_running_loop().create_task(listen_ready())
+    return READY_EVENTS.setdefault(str(game_id), asyncio.Event())
+
+
+def unwatch_ready(game_id):
+    READY_EVENTS.pop(str(game_id), None)
+
+
+async def notify_player_ready(game_id):
+    await timed('publish', r.publish(ready_channel(game_id), 1))
+
+
+def signal_player_ready(game_id):
+    """
+    Appelé par les vues (synchrones) après avoir passé ready_left/ready_right à True.
+    Un échec n'est pas bloquant : la boucle relit la base toutes les READY_FALLBACK_POLL s.
+    """
+    try:
+        async_to_sync(notify_player_ready)(str(game_id))
+    except Exception as e:
+        log.warning("Could not signal ready for game_id=%s: %s", game_id, e)
@@ -1,21 +1,193 @@
 # game/game_loop/redis_utils.py
 
-import redis
+import time
+import redis.asyncio as aioredis
 from django.conf import settings
 
-r = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=0)
+# Client Redis asynchrone partagé par tout le package game (consumers, boucle de jeu, fan-out).
+# Pool bloquant : au-delà de POOL_SIZE commandes simultanées, les suivantes attendent
+# une connexion libre (au plus POOL_TIMEOUT secondes) au lieu d'en ouvrir de nouvelles.
+POOL_SIZE = settings.GAME_REDIS_POOL_SIZE
+POOL_TIMEOUT = settings.GAME_REDIS_POOL_TIMEOUT
 
-def set_key(game_id, key, value):
-    r.set(f"{game_id}:{key}", value)
+pool = aioredis.BlockingConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=0,
+    max_connections=POOL_SIZE,
+    timeout=POOL_TIMEOUT
+)
+r = aioredis.Redis(connection_pool=pool)
 
-def get_key(game_id, key):
-    return r.get(f"{game_id}:{key}")
 
-def delete_key(game_id, key):
-    r.delete(f"{game_id}:{key}")
+def pool_in_use():
+    """Connexions actuellement empruntées au pool (file des connexions libres de BlockingConnectionPool)."""
+    available = getattr(pool, 'pool', None)
+    if available is None:
+        return 0
+    return pool.max_connections - available.qsize()
 
-def scan_and_delete_keys(game_id):
-    keys = list(r.scan_iter(f"{game_id}:*"))
-    for key in keys:
-        r.delete(key)
 
+class RedisMetrics:
+    """
+    Latence des commandes (par nom : nombre, cumul, max) et saturation du pool :
+    pic de connexions utilisées et nombre de commandes lancées alors que le pool était plein.
+    """
+    def __init__(self):
+        self.commands = {}   # { nom -> [nombre, durée cumulée, durée max] }
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peak_in_use = 0
+        self.saturated = 0
+
+    def started(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        in_use = pool_in_use()
+        self.peak_in_use = max(self.peak_in_use, in_use)
+        if in_use >= pool.max_connections:
+            self.saturated += 1
+
+    def finished(self, name, duration, failed=False):
+        self.in_flight -= 1
+        if failed:
+            self.errors += 1
+        entry = self.commands.get(name)
+        if entry is None:
+            entry = self.commands[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] = max(entry[2], duration)
+
+    def stats(self):
+        return {
+            'pool_size': pool.max_connections,
+            'pool_in_use': pool_in_use(),
+            'pool_peak_in_use': self.peak_in_use,
+            'pool_saturated_commands': self.saturated,
+            'peak_in_flight': self.peak_in_flight,
+            'errors': self.errors,
+            'commands': {
+                name: {
+                    'count': count,
+                    'total_ms': total * 1000,
+                    'avg_ms': total / count * 1000 if count else 0.0,
+                    'max_ms': longest * 1000,
+                }
+                for name, (count, total, longest) in self.commands.items()
+            },
+        }
+
+
+METRICS = RedisMetrics()
+
+
+async def timed(name, awaitable):
+    """Attend <awaitable> (une commande ou un pipeline Redis) en mesurant sa latence."""
+    METRICS.started()
+    started = time.perf_counter()
+    failed = False
+    try:
+        return await awaitable
+    except Exception:
+        failed = True
+        raise
+    finally:
+        METRICS.finished(name, time.perf_counter() - started, failed)
+
+
+def get_redis_stats():
+    return METRICS.stats()
+
+
+# Tout l'état d'une partie tient dans un seul hash Redis : {game_id}:state
+def state_key(game_id):
+    return f"{game_id}:state"
+
+async def set_key(game_id, key, value):
+    await timed('hset', r.hset(state_key(game_id), key, value))
+
+async def get_key(game_id, key):
+    return await timed('hget', r.hget(state_key(game_id), key))
+
+async def delete_key(game_id, key):
+    await timed('hdel', r.hdel(state_key(game_id), key))
+
+async def delete_state(game_id):
+    await timed('delete', r.delete(state_key(game_id)))
+
+
+class StateBatch:
+    """
+    Accès groupé à l'état Redis d'une partie pendant un tick.
+    load() fait un seul HGETALL, les set()/delete() sont accumulés puis
+    envoyés par flush() dans un unique pipeline (HSET + HDEL).
+    """
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.values = {}
+        self.updates = {}
+        self.deletions = set()
+
+    async def load(self):
+        return self.load_raw(await timed('hgetall', r.hgetall(state_key(self.game_id))))
+
+    def load_raw(self, raw):
+        self.values = {key.decode('utf-8'): value.decode('utf-8') for key, value in raw.items()}
+        return self
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.updates[key] = value
+        self.deletions.discard(key)
+        self.values[key] = value
+
+    def update(self, mapping):
+        for key, value in mapping.items():
+            self.set(key, value)
+
+    def delete(self, key):
+        self.updates.pop(key, None)
+        self.deletions.add(key)
+        self.values.pop(key, None)
+
+    def queue(self, pipe):
+        """Ajoute les écritures en attente au pipeline ; retourne False s'il n'y a rien à écrire."""
+        if not self.updates and not self.deletions:
+            return False
+        if self.updates:
+            pipe.hset(state_key(self.game_id), mapping=self.updates)
+        if self.deletions:
+            pipe.hdel(state_key(self.game_id), *self.deletions)
+        self.updates = {}
+        self.deletions = set()
+        return True
+
+    async def flush(self):
+        pipe = r.pipeline(transaction=False)
+        if self.queue(pipe):
+            await timed('flush', pipe.execute())
+
+
+async def load_batches(game_ids):
+    """Charge l'état de plusieurs parties en un seul aller-retour (un HGETALL par partie)."""
+    if not game_ids:
+        return []
+    pipe = r.pipeline(transaction=False)
+    for game_id in game_ids:
+        pipe.hgetall(state_key(game_id))
+    results = await timed('load_batches', pipe.execute())
+    return [StateBatch(game_id).load_raw(raw) for game_id, raw in zip(game_ids, results)]
+
+
+async def flush_batches(batches):
+    """Envoie les écritures de plusieurs parties dans un unique pipeline."""
+    pipe = r.pipeline(transaction=False)
+    pending = False
+    for batch in batches:
+        pending = batch.queue(pipe) or pending
+    if pending:
+        await timed('flush_batches', pipe.execute())
@@ -0,0 +1,266 @@
+# game/game_loop/scheduler.py
+
+import asyncio
+import itertools
+import time
+from django.conf import settings
+from .redis_utils import load_batches, flush_batches
+from .physics import ScalarPhysics
+from .tick_metrics import COUNTERS, SCHEDULER_METRICS, record
+from .game_log import get_log
+
+log = get_log('scheduler')
+
+TICK_RATE = settings.GAME_TICK_RATE
+MAX_CATCHUP_STEPS = settings.GAME_MAX_CATCHUP_STEPS
+
+# Passes consécutives dont le pipeline Redis échoue avant d'abandonner les parties (~1 s)
+MAX_FAILED_PASSES = TICK_RATE
+
+GAME_CLOCKS = {}   # { game_id -> FixedTimestepClock } des parties en cours
+
+# Numéro de partie propre au process, seul identifiant publié par la vue metrics
+# (la correspondance avec le game_id n'est écrite que dans les logs)
+GAME_SLOTS = {}    # { game_id -> numéro }
+_SLOT_NUMBERS = itertools.count(1)
+
+
+class FixedTimestepClock:
+    """
+    Horloge à pas fixe pour la boucle de jeu.
+    Les ticks visent des échéances absolues (début + n * dt) : le temps de calcul
+    d'un tick ne décale plus les suivants. En cas de retard, wait_next() demande
+    plusieurs pas de simulation, dans la limite de max_catchup_steps ; au-delà,
+    le retard est abandonné et compté dans skipped_steps.
+    """
+    def __init__(self, tick_rate=TICK_RATE, max_catchup_steps=MAX_CATCHUP_STEPS):
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.max_catchup_steps = max_catchup_steps
+        self.next_deadline = None
+        self.started_at = None
+        self.paused_time = 0.0
+        self.steps = 0
+        self.wakeups = 0
+        self.overruns = 0
+        self.skipped_steps = 0
+        self.max_lag = 0.0
+
+    def start(self):
+        now = time.monotonic()
+        self.started_at = now
+        self.next_deadline = now
+
+    async def wait_next(self):
+        """Attend la prochaine échéance et retourne le nombre de pas à simuler (>= 1)."""
+        now = time.monotonic()
+        delay = self.next_deadline - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+            now = time.monotonic()
+        return self.consume(now)
+
+    def consume(self, now):
+        """Calcule le nombre de pas dus à l'instant <now> et avance l'échéance."""
+        lag = now - self.next_deadline
+        self.wakeups += 1
+        self.max_lag = max(self.max_lag, lag)
+        steps = 1 + int(lag / self.dt)
+        if steps > 1:
+            self.overruns += 1
+            COUNTERS['overruns'] += 1
+        if steps > self.max_catchup_steps:
+            self.skipped_steps += steps - self.max_catchup_steps
+            COUNTERS['skipped_steps'] += steps - self.max_catchup_steps
+            steps = self.max_catchup_steps
+            self.next_deadline = now + self.dt
+        else:
+            self.next_deadline += steps * self.dt
+        self.steps += steps
+        COUNTERS['steps'] += steps
+        return steps
+
+    async def pause_for(self, duration):
+        """Pause volontaire (ex : après un but) : ni comptée comme du retard, ni rattrapée."""
+        paused_at = time.monotonic()
+        await asyncio.sleep(duration)
+        now = time.monotonic()
+        self.paused_time += now - paused_at
+        self.next_deadline = now
+
+    def stats(self):
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = time.monotonic() - self.started_at - self.paused_time
+        actual_rate = self.steps / elapsed if elapsed > 0 else 0.0
+        return {
+            'target_tick_rate': self.tick_rate,
+            'actual_tick_rate': actual_rate,
+            'accuracy': actual_rate / self.tick_rate if self.tick_rate else 0.0,
+            'steps': self.steps,
+            'wakeups': self.wakeups,
+            'overruns': self.overruns,
+            'skipped_steps': self.skipped_steps,
+            'max_lag_ms': self.max_lag * 1000,
+        }
+
+
+def register_clock(game_id, clock):
+    GAME_CLOCKS[str(game_id)] = clock
+    if str(game_id) not in GAME_SLOTS:
+        GAME_SLOTS[str(game_id)] = next(_SLOT_NUMBERS)
+        log.info("Partie game_id=%s : game=\"%s\" dans les metrics", game_id, GAME_SLOTS[str(game_id)])
+
+def unregister_clock(game_id):
+    GAME_CLOCKS.pop(str(game_id), None)
+    GAME_SLOTS.pop(str(game_id), None)
+
+def get_tick_stats(game_id=None):
+    """Statistiques de cadence d'une partie, ou de toutes les parties en cours."""
+    if game_id is not None:
+        clock = GAME_CLOCKS.get(str(game_id))
+        return clock.stats() if clock else None
+    return {gid: clock.stats() for gid, clock in list(GAME_CLOCKS.items())}
+
+def get_slot_tick_stats():
+    """Cadence des parties en cours, indexée par numéro de partie (sans game_id)."""
+    return {
+        str(GAME_SLOTS[gid]): clock.stats()
+        for gid, clock in list(GAME_CLOCKS.items()) if gid in GAME_SLOTS
+    }
+
+
+class SharedScheduler:
+    """
+    Mode moteur : une seule coroutine fait avancer toutes les parties à chaque tick,
+    au lieu d'une tâche qui se réveille 90 fois/s par partie.
+    Chaque partie garde son propre runner (état, événements, pause après un but) ;
+    le scheduler charge l'état Redis de toutes les parties en un pipeline, exécute
+    leurs ticks ensemble puis envoie toutes les écritures en un second pipeline.
+    La physique de toutes les parties passe par un seul moteur (<physics>, ScalarPhysics par défaut).
+    """
+    def __init__(self, tick_rate=TICK_RATE, max_catchup_steps=MAX_CATCHUP_STEPS, physics=None):
+        self.tick_rate = tick_rate
+        self.max_catchup_steps = max_catchup_steps
+        self.physics = physics if physics is not None else ScalarPhysics()
+        self.runners = {}   # { game_id -> GameRunner }
+        self.clock = None
+        self.task = None
+        self.failed_passes = 0
+
+    def register(self, runner):
+        self.runners[str(runner.game_id)] = runner
+        if self.task is None or self.task.done():
+            self.clock = FixedTimestepClock(self.tick_rate, self.max_catchup_steps)
+            self.clock.start()
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        register_clock(runner.game_id, self.clock)
+
+    def unregister(self, game_id):
+        # L'horloge reste inscrite pour get_tick_stats ; game_loop la retire à la fin
+        self.runners.pop(str(game_id), None)
+
+    async def run_game(self, runner):
+        """Inscrit la partie et attend sa fin (annulable par stop_game comme avant)."""
+        runner.done = asyncio.get_running_loop().create_future()
+        self.register(runner)
+        try:
+            await runner.done
+        finally:
+            self.unregister(runner.game_id)
+
+    async def run(self):
+        log.info("Shared scheduler started (%s ticks/s).", self.tick_rate)
+        while self.runners:
+            steps = await self.clock.wait_next()
+            try:
+                await self.tick_all(steps, time.monotonic())
+            except Exception as e:
+                # Erreur imprévue : les parties de la passe s'arrêtent proprement, la boucle continue
+                log.exception("Scheduler pass failed: %s", e)
+                for runner in list(self.runners.values()):
+                    self.finish(runner, error=e)
+        log.info("Shared scheduler idle, stopping.")
+
+    async def tick_all(self, steps, now):
+        runners = [runner for runner in list(self.runners.values()) if not runner.is_paused(now)]
+        if not runners:
+            return
+        tick_started = started = time.perf_counter()
+        try:
+            batches = await load_batches([runner.game_id for runner in runners])
+        except Exception as e:
+            # Passe sautée : elle est retentée au tick suivant
+            self.pass_failed(runners, 'load', e)
+            return
+        started = record(SCHEDULER_METRICS, 'load', started)
+        ready = await asyncio.gather(
+            *(runner.prepare(now, batch) for runner, batch in zip(runners, batches)),
+            return_exceptions=True
+        )
+        started = record(SCHEDULER_METRICS, 'prepare', started)
+        errors = {}
+        simulated = []
+        for runner, result in zip(runners, ready):
+            if isinstance(result, BaseException):
+                errors[runner.game_id] = result
+            elif result:
+                simulated.append(runner)
+
+        if simulated:
+            try:
+                scorers = await self.physics.simulate([runner.world for runner in simulated], steps)
+            except Exception as e:
+                log.error("Physics step failed: %s", e)
+                for runner in simulated:
+                    errors[runner.game_id] = e
+                simulated, scorers = [], []
+            started = record(SCHEDULER_METRICS, 'physics', started)
+            completed = await asyncio.gather(
+                *(runner.complete(scorer, flush=False) for runner, scorer in zip(simulated, scorers)),
+                return_exceptions=True
+            )
+            for runner, result in zip(simulated, completed):
+                if isinstance(result, BaseException):
+                    errors[runner.game_id] = result
+            started = record(SCHEDULER_METRICS, 'complete', started)
+
+        try:
+            await flush_batches([runner.world.batch for runner in runners])
+        except Exception as e:
+            # Écritures du tick perdues ; le prochain snapshot réécrit l'état complet
+            self.pass_failed(runners, 'flush', e)
+        else:
+            self.failed_passes = 0
+        record(SCHEDULER_METRICS, 'flush', started)
+        record(SCHEDULER_METRICS, 'tick', tick_started)
+
+        for runner in runners:
+            error = errors.get(runner.game_id)
+            if error is not None:
+                log.error("Tick failed for game_id=%s: %s", runner.game_id, error)
+                self.finish(runner, error=error)
+            elif runner.stopped:
+                self.finish(runner)
+
+    def pass_failed(self, runners, stage, error):
+        """Échec Redis d'une passe ; après MAX_FAILED_PASSES échecs d'affilée, les parties sont abandonnées."""
+        self.failed_passes += 1
+        log.warning("Redis %s failed (%d in a row): %s", stage, self.failed_passes, error)
+        if self.failed_passes >= MAX_FAILED_PASSES:
+            log.error("Redis unavailable for %d passes, stopping %d game(s).", self.failed_passes, len(runners))
+            self.failed_passes = 0
+            for runner in runners:
+                self.finish(runner, error=error)
+
+    def finish(self, runner, error=None):
+        self.unregister(runner.game_id)
+        if runner.done is None or runner.done.done():
+            return
+        if error is not None:
+            runner.done.set_exception(error)
+        else:
+            runner.done.set_result(True)
+
+
+SHARED_SCHEDULER = SharedScheduler()
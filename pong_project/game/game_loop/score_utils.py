@@ -1,80 +1,74 @@
 # game/game_loop/score_utils.py
 
 from channels.layers import get_channel_layer
-from asgiref.sync import sync_to_async
+from .db_executor import run_db
 from .broadcast import notify_game_finished, notify_powerup_expired, notify_bumper_expired
-from .redis_utils import set_key, get_key, scan_and_delete_keys, delete_key
+from .redis_utils import delete_state
 from .models_utils import is_online_gameSession, set_gameSession_status, create_gameResults, get_LocalTournament
 
-from .powerups_utils import handle_powerups_spawn, delete_powerup_redis
-from .bumpers_utils import handle_bumpers_spawn, delete_bumper_redis
+from .bumpers_utils import deactivate_bumper
+from .powerups_utils import deactivate_powerup
+from .game_log import get_log
+
+log = get_log('score')
+
 WIN_SCORE = 3 
 
 
-async def reset_all_objects(game_id, powerup_orbs, bumpers):
+async def reset_all_objects(world):
     """Reset all active powerups and bumpers when a point is scored."""
-   
-    for powerup in powerup_orbs:
+    for powerup in world.powerup_orbs:
         if powerup.active:
-            delete_powerup_redis(game_id, powerup)
-            powerup.deactivate()
-            await notify_powerup_expired(game_id, powerup)
+            deactivate_powerup(world, powerup)
+            await notify_powerup_expired(world, powerup)
 
-   
-    for bumper in bumpers:
+
+    for bumper in world.bumpers:
         if bumper.active:
-            delete_bumper_redis(game_id, bumper)
-            bumper.deactivate()
-            await notify_bumper_expired(game_id, bumper)
+            deactivate_bumper(world, bumper)
+            await notify_bumper_expired(world, bumper)
 
-   
-    keys_to_delete = [
-        "paddle_left_sticky", "paddle_right_sticky",
-        "paddle_left_inverted", "paddle_right_inverted",
-        "paddle_left_ice_effect", "paddle_right_ice_effect",
-        "paddle_left_speed_boost", "paddle_right_speed_boost",
-        "flash_effect"
-    ]
-    for key in keys_to_delete:
-        delete_key(game_id, key)
 
-   
-    initial_height = float(get_key(game_id, "initial_paddle_height"))
-    set_key(game_id, "paddle_left_height", initial_height)
-    set_key(game_id, "paddle_right_height", initial_height)
+    world.timers.cancel_tag('effect')
+    world.clear_effects()
+    world.paddle_original_height.clear()
+
 
+    world.paddle_left.height = world.initial_paddle_height
+    world.paddle_right.height = world.initial_paddle_height
 
-def handle_score(game_id, scorer):
+
+def handle_score(world, scorer):
     if scorer == 'score_left':
-        score_left = int(get_key(game_id, "score_left") or 0) + 1
-        set_key(game_id, "score_left", score_left)
-        print(f"[loop.py] Player Left scored. Score: {score_left} - {get_key(game_id, 'score_right')}")            
+        world.score_left += 1
+        world.batch.set("score_left", world.score_left)
+        log.info("game_id=%s - Player Left scored. Score: %s - %s", world.game_id, world.score_left, world.score_right)
 
     else :
-        score_right = int(get_key(game_id, "score_right") or 0) + 1
-        set_key(game_id, "score_right", score_right)
-        print(f"[loop.py] Player Right scored. Score: {get_key(game_id, 'score_left')} - {score_right}")
+        world.score_right += 1
+        world.batch.set("score_right", world.score_right)
+        log.info("game_id=%s - Player Right scored. Score: %s - %s", world.game_id, world.score_left, world.score_right)
 
 
 
-def winner_detected(game_id):
+def winner_detected(world):
 
-    score_left = int(get_key(game_id, "score_left") or 0)
-    score_right = int(get_key(game_id, "score_right") or 0)
+    score_left = world.score_left
+    score_right = world.score_right
 
     if (score_left == WIN_SCORE or score_right == WIN_SCORE):
         return True
     return False
 
-async def finish_game(game_id):
-   
-    score_left = int(get_key(game_id, "score_left") or 0)
-    score_right = int(get_key(game_id, "score_right") or 0)
+async def finish_game(world):
+    game_id = world.game_id
+    score_left = world.score_left
+    score_right = world.score_right
 
    
     gameSession = await set_gameSession_status(game_id, "finished")
     if not gameSession:
-        print(f"[finish_game] GameSession {game_id} does not exist.")
+        log.warning("GameSession %s does not exist.", game_id)
         return
 
    
@@ -107,31 +101,31 @@ async def finish_game(game_id):
    
     tournament = await get_LocalTournament(game_id, "semifinal1")
     if tournament:
-        print(f"[finish_game] this game was semifinal1 from tournament game_id={game_id}")
+        log.info("this game was semifinal1 from tournament game_id=%s", game_id)
         tournament.status = 'semifinal1_done'
         tournament.winner_semifinal_1 = winner_local
-        await sync_to_async(tournament.save)()
+        await run_db(tournament.save)
     else:
         tournament = await get_LocalTournament(game_id, "semifinal2")
         if tournament:
             tournament.status = 'semifinal2_done'
             tournament.winner_semifinal_2 = winner_local
-            await sync_to_async(tournament.save)()
+            await run_db(tournament.save)
         else:
             tournament = await get_LocalTournament(game_id, "final")
             if tournament:
                 tournament.status = 'finished'
                 tournament.winner_final = winner_local
-                await sync_to_async(tournament.save)()
+                await run_db(tournament.save)
             else:
-                print(f"[finish_game] No tournament found for game_id={game_id}")
+                log.warning("No tournament found for game_id=%s", game_id)
 
     tournament_id = gameSession.tournament_id
-    print(f"[finish_game] tournament_id={tournament_id}")
+    log.info("finish_game tournament_id=%s", tournament_id)
     if gameSession_isOnline:
         await notify_game_finished(game_id, tournament_id, winner, looser)
     else :
         await notify_game_finished(game_id, tournament_id, winner_local, looser_local)
 
-    scan_and_delete_keys(game_id)
-    print(f"[loop.py] Redis keys deleted for game_id={game_id}")
+    await delete_state(game_id)
+    log.debug("Redis state deleted for game_id=%s", game_id)
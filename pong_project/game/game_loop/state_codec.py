@@ -0,0 +1,58 @@
+# game/game_loop/state_codec.py
+
+from django.conf import settings
+
+# Nombre de frames delta entre deux keyframes complètes
+KEYFRAME_INTERVAL = settings.GAME_KEYFRAME_INTERVAL
+
+# Précision des coordonnées envoyées (le canvas client ne dessine pas en dessous du 1/100e de pixel)
+FLOAT_DECIMALS = 2
+
+
+def quantize(value):
+    if isinstance(value, float):
+        return round(value, FLOAT_DECIMALS)
+    if isinstance(value, list):
+        return [quantize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: quantize(item) for key, item in value.items()}
+    return value
+
+
+class StateEncoder:
+    """
+    Encode les game_state d'une partie en keyframes + deltas.
+    - keyframe : {'type': 'game_state', 'tick': N, <tous les champs>} (format historique + tick)
+    - delta    : {'type': 'game_state_delta', 'tick': N, 'base': <tick de la frame précédente>,
+                  'changes': {<champs modifiés>}}
+    Un client qui voit un 'base' différent de son dernier tick a raté une frame :
+    il demande une resync et la prochaine frame envoyée est une keyframe.
+    """
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.last_state = None
+        self.last_tick = None
+        self.frames_since_keyframe = 0
+        self.keyframe_requested = True
+
+    def request_keyframe(self):
+        self.keyframe_requested = True
+
+    def encode(self, tick, state):
+        """Retourne la frame à envoyer pour <state>, ou None si rien n'a changé."""
+        state = quantize(state)
+        if self.keyframe_requested or self.frames_since_keyframe >= self.keyframe_interval:
+            frame = {'type': 'game_state', 'tick': tick}
+            frame.update(state)
+            self.keyframe_requested = False
+            self.frames_since_keyframe = 0
+        else:
+            last_state = self.last_state
+            changes = {key: value for key, value in state.items() if last_state.get(key) != value}
+            if not changes:
+                return None
+            frame = {'type': 'game_state_delta', 'tick': tick, 'base': self.last_tick, 'changes': changes}
+            self.frames_since_keyframe += 1
+        self.last_state = state
+        self.last_tick = tick
+        return frame
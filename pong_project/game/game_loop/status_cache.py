@@ -0,0 +1,31 @@
+# game/game_loop/status_cache.py
+
+import time
+from django.conf import settings
+
+# Durée de validité d'une entrée : au-delà, la boucle relit la base une fois.
+# Sert de filet de sécurité si un changement de statut a lieu dans un autre process.
+STATUS_CACHE_TTL = settings.GAME_STATUS_CACHE_TTL
+
+_STATUS_CACHE = {}   # { game_id -> (status, horodatage monotonic) }
+
+
+def get_cached_status(game_id):
+    """Retourne le statut en cache de la partie, ou None s'il est absent ou périmé."""
+    entry = _STATUS_CACHE.get(str(game_id))
+    if entry is None:
+        return None
+    status, stored_at = entry
+    if time.monotonic() - stored_at > STATUS_CACHE_TTL:
+        return None
+    return status
+
+
+def set_cached_status(game_id, status):
+    """Pousse un nouveau statut dans le cache (appelé à chaque changement de statut)."""
+    _STATUS_CACHE[str(game_id)] = (status, time.monotonic())
+
+
+def invalidate_status(game_id):
+    """Force la prochaine lecture à repasser par la base."""
+    _STATUS_CACHE.pop(str(game_id), None)
@@ -0,0 +1,355 @@
+# game/game_loop/tick_metrics.py
+
+import asyncio
+import time
+from array import array
+from django.conf import settings
+from django.core.cache import cache
+from .db_executor import get_db_executor_stats
+from .redis_utils import get_redis_stats
+from .local_fanout import get_connection_totals
+from .game_log import get_log
+
+log = get_log('metrics')
+
+METRICS_ENABLED = settings.GAME_METRICS_ENABLED
+
+# Taille des fenêtres glissantes (derniers échantillons) sur lesquelles p50/p99 sont calculés
+GAME_WINDOW = settings.GAME_METRICS_GAME_WINDOW
+ENGINE_WINDOW = settings.GAME_METRICS_ENGINE_WINDOW
+
+# Période (s) de la sonde de retard de la boucle asyncio
+LAG_INTERVAL = settings.GAME_METRICS_LAG_INTERVAL
+
+# Période (s) de publication du snapshot d'un process moteur (shard) dans le cache Django
+PUBLISH_INTERVAL = settings.GAME_METRICS_PUBLISH_INTERVAL
+
+QUANTILES = (0.5, 0.99)
+
+# Phases d'un tick, dans l'ordre d'exécution :
+# - input : statut de la partie et état Redis (inputs des joueurs) ;
+# - paddles / ball : déplacements (ball inclut les rebonds murs, bumpers, orbes) ;
+# - collisions : raquettes et détection des points ;
+# - spawn : minuteries (fins d'effets, expirations) et apparitions ;
+# - scoring : but marqué (remise à zéro, score, sauvegarde) ;
+# - broadcast : envoi des événements et du game_state ; flush : écriture Redis ;
+# - tick : le tick complet (mode 'per_game').
+PHASES = ('input', 'paddles', 'ball', 'collisions', 'spawn', 'scoring', 'broadcast', 'flush', 'tick')
+
+# Passe du scheduler partagé, pour toutes les parties à la fois (mode 'shared')
+SCHEDULER_PHASES = ('load', 'prepare', 'physics', 'complete', 'flush', 'tick')
+
+PROCESS_NAME = 'asgi'   # 'shard-<n>' dans un process moteur
+
+# Compteurs du process depuis son démarrage (les horloges des parties terminées disparaissent)
+COUNTERS = {
+    'steps': 0,
+    'overruns': 0,
+    'skipped_steps': 0,
+    'games_started': 0,
+    'games_finished': 0,
+}
+
+
+class PhaseWindow:
+    """
+    Durées d'UNE phase : les <size> dernières dans un tampon circulaire (array de
+    doubles, 8 octets par échantillon), plus nombre et cumul depuis le début.
+    observe() ne fait qu'une écriture ; les quantiles sont calculés à la lecture.
+    """
+    __slots__ = ('samples', 'size', 'pos', 'count', 'total')
+
+    def __init__(self, size):
+        self.samples = array('d', bytes(8 * size))
+        self.size = size
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, duration):
+        pos = self.pos
+        self.samples[pos] = duration
+        self.pos = (pos + 1) % self.size
+        self.count += 1
+        self.total += duration
+
+    def quantiles(self):
+        values = sorted(self.samples[:min(self.count, self.size)])
+        if not values:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES}
+
+    def stats(self):
+        return {'quantiles': self.quantiles(), 'count': self.count, 'sum': self.total}
+
+
+class TickMetrics:
+    """
+    Fenêtres par phase d'UNE partie (ou d'un agrégat). Chaque échantillon d'une partie
+    est aussi versé dans <aggregate> : l'agrégat moteur couvre toutes les parties du process.
+    """
+    def __init__(self, phases, size, aggregate=None):
+        self.windows = {phase: PhaseWindow(size) for phase in phases}
+        # { phase -> fenêtres à alimenter } : la sienne, puis celle de l'agrégat
+        self.targets = {
+            phase: (window,) if aggregate is None else (window, aggregate.windows[phase])
+            for phase, window in self.windows.items()
+        }
+
+    def observe(self, phase, duration):
+        for window in self.targets[phase]:
+            window.observe(duration)
+
+    def stats(self):
+        return {phase: window.stats() for phase, window in self.windows.items() if window.count}
+
+
+ENGINE_METRICS = TickMetrics(PHASES, ENGINE_WINDOW)
+SCHEDULER_METRICS = TickMetrics(SCHEDULER_PHASES, ENGINE_WINDOW)
+GAME_METRICS = {}   # { game_id -> TickMetrics } des parties en cours
+
+
+def game_metrics(game_id):
+    """Fenêtres de la partie (None si GAME_METRICS_ENABLED est faux : rien n'est mesuré)."""
+    if not METRICS_ENABLED:
+        return None
+    metrics = GAME_METRICS.get(str(game_id))
+    if metrics is None:
+        metrics = GAME_METRICS[str(game_id)] = TickMetrics(PHASES, GAME_WINDOW, ENGINE_METRICS)
+        COUNTERS['games_started'] += 1
+    return metrics
+
+
+def forget_game_metrics(game_id):
+    if GAME_METRICS.pop(str(game_id), None) is not None:
+        COUNTERS['games_finished'] += 1
+
+
+def record(metrics, phase, started):
+    """
+    Enregistre la durée écoulée depuis <started> (time.perf_counter()) et retourne
+    l'instant de fin, qui sert de début à la phase suivante.
+    """
+    now = time.perf_counter()
+    if metrics is not None:
+        metrics.observe(phase, now - started)
+    return now
+
+
+class LoopLagMonitor:
+    """
+    Retard de la boucle asyncio : une tâche dort LAG_INTERVAL s et mesure de combien
+    son réveil dépasse l'échéance. Un tick ou un callback trop long se voit ici.
+    """
+    def __init__(self, interval=LAG_INTERVAL):
+        self.interval = interval
+        self.window = PhaseWindow(ENGINE_WINDOW)
+        self.max_lag = 0.0
+        self.task = None
+
+    def ensure_started(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - started - self.interval)
+            self.window.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self):
+        stats = self.window.stats()
+        stats['max'] = self.max_lag
+        return stats
+
+
+LOOP_LAG = LoopLagMonitor()
+
+
+def ensure_lag_monitor():
+    """Démarre la sonde de retard dans la boucle courante (une fois par process)."""
+    if METRICS_ENABLED:
+        LOOP_LAG.ensure_started()
+
+
+def snapshot():
+    """
+    Mesures agrégées du process, en types simples (publiables tels quels par les shards).
+    Aucun game_id : un identifiant de partie suffit à rejoindre puis interrompre la partie.
+    La cadence par partie est indexée par le numéro de partie du process (voir GAME_SLOTS).
+    """
+    # Import local : scheduler importe ce module
+    from .scheduler import get_slot_tick_stats
+    return {
+        'process': PROCESS_NAME,
+        'active_games': len(GAME_METRICS),
+        'counters': dict(COUNTERS),
+        'loop_lag': LOOP_LAG.stats(),
+        'engine': ENGINE_METRICS.stats(),
+        'scheduler': SCHEDULER_METRICS.stats(),
+        'db': get_db_executor_stats(),
+        'redis': get_redis_stats(),
+        'connections': get_connection_totals(),
+        'games': get_slot_tick_stats(),
+    }
+
+
+def get_phase_stats(game_id):
+    """p50/p99 des phases d'une partie (journal de fin de partie ; jamais exposé par la vue metrics)."""
+    metrics = GAME_METRICS.get(str(game_id))
+    return metrics.stats() if metrics else None
+
+
+def snapshot_cache_key(process):
+    return f"game_metrics:{process}"
+
+
+def start_shard_metrics(index):
+    """
+    Process moteur : nomme ses séries 'shard-<index>' et publie son snapshot toutes les
+    PUBLISH_INTERVAL s. La vue metrics du serveur ASGI le lit dans le cache (voir get_snapshots).
+    """
+    global PROCESS_NAME
+    PROCESS_NAME = f"shard-{index}"
+    if METRICS_ENABLED:
+        LOOP_LAG.ensure_started()
+        asyncio.get_running_loop().create_task(publish_snapshots())
+
+
+async def publish_snapshots():
+    while True:
+        try:
+            await cache.aset(snapshot_cache_key(PROCESS_NAME), snapshot(), timeout=PUBLISH_INTERVAL * 3)
+        except Exception as e:
+            log.warning("Metrics snapshot not published: %s", e)
+        await asyncio.sleep(PUBLISH_INTERVAL)
+
+
+def get_snapshots(shard_count=0):
+    """Snapshot de ce process, puis ceux des shards encore vivants (clé expirée = shard absent)."""
+    snapshots = [snapshot()]
+    if shard_count > 0:
+        keys = [snapshot_cache_key(f"shard-{index}") for index in range(shard_count)]
+        try:
+            published = cache.get_many(keys)
+        except Exception as e:
+            log.warning("Shard metrics unavailable: %s", e)
+            published = {}
+        snapshots.extend(published[key] for key in keys if key in published)
+    return snapshots
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels.items()) + '}'
+
+
+def _summary(lines, name, stats, **labels):
+    for q, value in stats['quantiles'].items():
+        lines.append(f"{name}{_labels(**labels, quantile=q)} {value:.9f}")
+    lines.append(f"{name}_sum{_labels(**labels)} {stats['sum']:.9f}")
+    lines.append(f"{name}_count{_labels(**labels)} {stats['count']}")
+
+
+def render_prometheus(snapshots):
+    """Format texte Prometheus (0.0.4) pour une liste de snapshots (un par process)."""
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family('pong_tick_phase_seconds', 'summary', "Tick phase duration over all games of the process, rolling window.")
+    for snap in snapshots:
+        for phase, stats in snap['engine'].items():
+            _summary(lines, 'pong_tick_phase_seconds', stats, process=snap['process'], phase=phase)
+
+    family('pong_scheduler_phase_seconds', 'summary', "Shared scheduler pass duration, all games at once, rolling window.")
+    for snap in snapshots:
+        for phase, stats in snap['scheduler'].items():
+            _summary(lines, 'pong_scheduler_phase_seconds', stats, process=snap['process'], phase=phase)
+
+    family('pong_event_loop_lag_seconds', 'summary', "Asyncio event loop wakeup lag, rolling window.")
+    for snap in snapshots:
+        _summary(lines, 'pong_event_loop_lag_seconds', snap['loop_lag'], process=snap['process'])
+
+    family('pong_event_loop_lag_max_seconds', 'gauge', "Largest event loop lag since process start.")
+    for snap in snapshots:
+        lines.append(f"pong_event_loop_lag_max_seconds{_labels(process=snap['process'])} {snap['loop_lag']['max']:.9f}")
+
+    family('pong_active_games', 'gauge', "Games loaded in this process (countdown included).")
+    for snap in snapshots:
+        lines.append(f"pong_active_games{_labels(process=snap['process'])} {snap['active_games']}")
+
+    family('pong_db_queue_wait_seconds', 'summary', "Time ORM calls wait for a free game-db worker thread, rolling window.")
+    for snap in snapshots:
+        db = snap['db']
+        stats = {
+            'quantiles': {0.5: db['wait_p50_ms'] / 1000, 0.99: db['wait_p99_ms'] / 1000},
+            'sum': db['wait_total_ms'] / 1000,
+            'count': db['started'],
+        }
+        _summary(lines, 'pong_db_queue_wait_seconds', stats, process=snap['process'])
+
+    family('pong_redis_command_seconds', 'summary', "Redis command (or pipeline) latency by command name.")
+    for snap in snapshots:
+        for command, stats in snap['redis']['commands'].items():
+            labels = _labels(process=snap['process'], command=command)
+            lines.append(f"pong_redis_command_seconds_sum{labels} {stats['total_ms'] / 1000:.9f}")
+            lines.append(f"pong_redis_command_seconds_count{labels} {stats['count']}")
+
+    family('pong_redis_command_max_seconds', 'gauge', "Slowest Redis command since process start, by command name.")
+    for snap in snapshots:
+        for command, stats in snap['redis']['commands'].items():
+            lines.append(f"pong_redis_command_max_seconds{_labels(process=snap['process'], command=command)} {stats['max_ms'] / 1000:.9f}")
+
+    gauges = (
+        ('pong_db_queue_wait_max_seconds', 'db', 'wait_max_ms', 1000, "Longest wait for a game-db worker since process start."),
+        ('pong_db_queued_calls', 'db', 'queued', 1, "ORM calls waiting for a game-db worker."),
+        ('pong_db_in_flight_calls', 'db', 'in_flight', 1, "ORM calls submitted to the game-db pool and not finished (queued or running)."),
+        ('pong_db_workers', 'db', 'workers', 1, "Size of the game-db thread pool (GAME_DB_EXECUTOR_WORKERS)."),
+        ('pong_redis_pool_size', 'redis', 'pool_size', 1, "Redis connection pool size (GAME_REDIS_POOL_SIZE)."),
+        ('pong_redis_pool_in_use', 'redis', 'pool_in_use', 1, "Redis connections currently borrowed from the pool."),
+        ('pong_redis_pool_peak_in_use', 'redis', 'pool_peak_in_use', 1, "Most Redis connections borrowed at once since process start."),
+        ('pong_redis_peak_in_flight_commands', 'redis', 'peak_in_flight', 1, "Most Redis commands awaited at once since process start."),
+        ('pong_ws_connections', 'connections', 'connections', 1, "Game WebSocket connections open in this process."),
+        ('pong_ws_pending_events', 'connections', 'pending_events', 1, "Events and control messages waiting in connection mailboxes."),
+    )
+    for name, section, key, scale, help_text in gauges:
+        family(name, 'gauge', help_text)
+        for snap in snapshots:
+            lines.append(f"{name}{_labels(process=snap['process'])} {snap[section][key] / scale}")
+
+    game_gauges = (
+        ('pong_game_tick_rate', 'actual_tick_rate', 1, "Simulation steps per second of a running game (pauses excluded)."),
+        ('pong_game_tick_accuracy', 'accuracy', 1, "Actual over target tick rate of a running game (1 = on time)."),
+        ('pong_game_tick_max_lag_seconds', 'max_lag_ms', 1000, "Largest clock lag of a running game."),
+    )
+    for name, key, scale, help_text in game_gauges:
+        family(name, 'gauge', help_text)
+        for snap in snapshots:
+            for slot, stats in snap['games'].items():
+                lines.append(f"{name}{_labels(process=snap['process'], game=slot)} {stats[key] / scale:.6f}")
+
+    counters = (
+        ('pong_tick_steps_total', 'counters', 'steps', "Simulation steps run."),
+        ('pong_tick_overruns_total', 'counters', 'overruns', "Clock wakeups that were late by at least one tick."),
+        ('pong_tick_skipped_steps_total', 'counters', 'skipped_steps', "Steps dropped beyond GAME_MAX_CATCHUP_STEPS."),
+        ('pong_games_started_total', 'counters', 'games_started', "Games started."),
+        ('pong_games_finished_total', 'counters', 'games_finished', "Games finished."),
+        ('pong_db_calls_total', 'db', 'completed', "ORM calls run by the game-db pool."),
+        ('pong_db_errors_total', 'db', 'errors', "ORM calls that raised a database error."),
+        ('pong_redis_pool_saturated_commands_total', 'redis', 'pool_saturated_commands', "Redis commands started while every pool connection was in use."),
+        ('pong_redis_errors_total', 'redis', 'errors', "Redis commands that raised an error."),
+        ('pong_ws_frames_received_total', 'connections', 'frames_received', "game_state frames handed to connection mailboxes."),
+        ('pong_ws_frames_sent_total', 'connections', 'frames_sent', "game_state frames sent to clients."),
+        ('pong_ws_frames_dropped_total', 'connections', 'frames_dropped', "game_state frames replaced by a newer one before a slow client took them."),
+        ('pong_ws_events_sent_total', 'connections', 'events_sent', "Game event messages sent to clients."),
+    )
+    for name, section, key, help_text in counters:
+        family(name, 'counter', help_text)
+        for snap in snapshots:
+            lines.append(f"{name}{_labels(process=snap['process'])} {snap[section][key]}")
+
+    return '\n'.join(lines) + '\n'
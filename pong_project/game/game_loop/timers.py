@@ -0,0 +1,54 @@
+# game/game_loop/timers.py
+
+import heapq
+import inspect
+import itertools
+from django.conf import settings
+
+TICK_RATE = settings.GAME_TICK_RATE
+
+
+class GameTimers:
+    """
+    Minuteries d'UNE partie : un min-tas d'échéances exprimées en ticks de simulation.
+    Avancées par la boucle de jeu (run_due à chaque fin de tick) et non par l'horloge
+    murale : elles s'arrêtent pendant la pause après un but et ne dépendent pas de la
+    charge du serveur. Remplace les tâches asyncio.sleep et les scans d'expiration.
+    """
+    def __init__(self, current_tick, tick_rate=TICK_RATE):
+        self.current_tick = current_tick   # callable : tick courant de la partie
+        self.tick_rate = tick_rate
+        self.heap = []   # [échéance, ordre, callback, args, tag, annulé]
+        self.order = itertools.count()
+
+    def ticks_for(self, seconds):
+        return max(1, round(seconds * self.tick_rate))
+
+    def schedule(self, seconds, callback, *args, tag=None):
+        """Appelle callback(*args) (fonction ou coroutine) dans <seconds> secondes de jeu."""
+        entry = [self.current_tick() + self.ticks_for(seconds), next(self.order), callback, args, tag, False]
+        heapq.heappush(self.heap, entry)
+        return entry
+
+    def cancel(self, entry):
+        entry[5] = True
+
+    def cancel_tag(self, tag):
+        for entry in self.heap:
+            if entry[4] == tag:
+                entry[5] = True
+
+    def clear(self):
+        self.heap = []
+
+    async def run_due(self):
+        """Déclenche, dans l'ordre des échéances, toutes les minuteries dues au tick courant."""
+        tick = self.current_tick()
+        heap = self.heap
+        while heap and heap[0][0] <= tick:
+            _, _, callback, args, _, cancelled = heapq.heappop(heap)
+            if cancelled:
+                continue
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
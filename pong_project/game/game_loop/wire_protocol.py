@@ -0,0 +1,95 @@
+# game/game_loop/wire_protocol.py
+
+import struct
+from django.conf import settings
+
+# Sous-protocoles WebSocket proposés par le client (new WebSocket(url, [BINARY, JSON]))
+BINARY_SUBPROTOCOL = "pong.bin.v2"
+JSON_SUBPROTOCOL = "pong.json"
+BINARY_ENABLED = settings.GAME_WS_BINARY_PROTOCOL
+
+PROTOCOL_VERSION = 2
+FRAME_GAME_STATE = 1
+
+# Quantification : positions au 1/10e de pixel, vitesses au 1/100e
+POSITION_SCALE = 10
+SPEED_SCALE = 100
+
+FLAG_FLASH_EFFECT = 1 << 0
+
+# Index des types de power-up sur le fil (même ordre que POWERUP_TYPES dans live_game.js)
+POWERUP_TYPES = ('invert', 'shrink', 'ice', 'speed', 'flash', 'sticky')
+POWERUP_INDEX = {effect_type: index for index, effect_type in enumerate(POWERUP_TYPES)}
+
+# Frame game_state (little-endian) :
+#   en-tête   : version u8, type u8, tick u32
+#   corps     : ball_x i16, ball_y i16, ball_size u8, ball_speed_x i16, ball_speed_y i16,
+#               paddle_left_y i16, paddle_right_y i16, paddle_width u8,
+#               paddle_left_height u16, paddle_right_height u16,
+#               score_left u8, score_right u8, flags u8
+#   power-ups : count u8 puis count x (id u8, type u8, x i16, y i16)
+#   bumpers   : count u8 puis count x (id u8, x i16, y i16, size u8)
+HEADER = struct.Struct("<BBI")
+BODY = struct.Struct("<hhBhhhhBHHBBB")
+POWERUP = struct.Struct("<BBhh")
+BUMPER = struct.Struct("<BhhB")
+COUNT = struct.Struct("<B")
+
+# Input client -> serveur : version u8, code u8
+#   bits 0-1 : action (0 = stop_move, 1 = start_move, 2 = resync)
+#   bit 2    : joueur (0 = left, 1 = right)
+#   bit 3    : direction (0 = up, 1 = down)
+INPUT = struct.Struct("<BB")
+INPUT_ACTIONS = ('stop_move', 'start_move', 'resync')
+
+
+def _position(value):
+    return int(round(value * POSITION_SCALE))
+
+def _speed(value):
+    return int(round(value * SPEED_SCALE))
+
+
+def encode_game_state(tick, state):
+    """Encode un état complet (voir game_state_fields) en frame binaire."""
+    flags = FLAG_FLASH_EFFECT if state['flash_effect'] else 0
+    parts = [
+        HEADER.pack(PROTOCOL_VERSION, FRAME_GAME_STATE, tick),
+        BODY.pack(
+            _position(state['ball_x']), _position(state['ball_y']), int(state['ball_size']),
+            _speed(state['ball_speed_x']), _speed(state['ball_speed_y']),
+            _position(state['paddle_left_y']), _position(state['paddle_right_y']),
+            int(state['paddle_width']),
+            int(state['paddle_left_height']), int(state['paddle_right_height']),
+            state['score_left'], state['score_right'], flags
+        ),
+    ]
+    powerups = state['powerups']
+    parts.append(COUNT.pack(len(powerups)))
+    for powerup in powerups:
+        parts.append(POWERUP.pack(powerup['id'], POWERUP_INDEX[powerup['type']], _position(powerup['x']), _position(powerup['y'])))
+    bumpers = state['bumpers']
+    parts.append(COUNT.pack(len(bumpers)))
+    for bumper in bumpers:
+        parts.append(BUMPER.pack(bumper['id'], _position(bumper['x']), _position(bumper['y']), int(bumper['size'])))
+    return b"".join(parts)
+
+
+def decode_input(bytes_data):
+    """
+    Décode un input binaire en dict au format JSON historique
+    ({'action', 'player', 'direction'}), ou None si la frame est invalide.
+    """
+    if len(bytes_data) != INPUT.size:
+        return None
+    version, code = INPUT.unpack(bytes_data)
+    if version != PROTOCOL_VERSION:
+        return None
+    action_index = code & 0b11
+    if action_index >= len(INPUT_ACTIONS):
+        return None
+    return {
+        'action': INPUT_ACTIONS[action_index],
+        'player': 'right' if code & 0b100 else 'left',
+        'direction': 'down' if code & 0b1000 else 'up',
+    }
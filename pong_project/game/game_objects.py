@@ -1,10 +1,29 @@
 # game/game_objects.py
 
-import random
-import math
 import time
+from .game_loop.modifiers import PaddleModifiers, BallModifiers
+from .game_loop.game_log import get_log
+
+log = get_log('powerups')
+
+POWERUP_COLORS = {
+    'invert': (255, 105, 180),  # Pink
+    'shrink': (255, 0, 0),      # Red
+    'ice': (0, 255, 255),       # Cyan
+    'speed': (255, 215, 0),     # Gold
+    'flash': (255, 255, 0),     # Yellow
+    # 'sticky': (50, 205, 50)     # Lime green
+}
+BUMPER_COLOR = (255, 255, 255)
+
+
+# Objets de jeu à __slots__ : pas de __dict__ par instance. Les orbes et bumpers portent
+# un identifiant entier stable dans la partie (clés Redis powerup_<id>_*, bumper_<id>_*
+# et champ 'id' sur le fil).
 
 class Paddle: 
+    __slots__ = ('position', 'width', 'height', 'x', 'y', 'speed', 'velocity', 'modifiers')
+
     def __init__(self, position, size, speed):
         """
         position: 'left' ou 'right'
@@ -18,18 +37,19 @@ class Paddle:
         self.y = 200 - self.height // 2
         self.speed = speed
         self.velocity = 0
+        self.modifiers = PaddleModifiers()
         
 
-    def move(self, direction, is_on_ice, terrain_top, terrain_bottom, speed_boost=False):
+    def move(self, direction, terrain_top, terrain_bottom):
         ice_acceleration = 0.5
         ice_friction = 0.02
-        if is_on_ice:
+        modifiers = self.modifiers
+        if modifiers.on_ice:
             if direction != 0:
                 self.velocity += direction * ice_acceleration
             self.velocity *= (1 - ice_friction)
         else:
-            speed = self.speed * 1.5 if speed_boost else self.speed
-            self.velocity = direction * speed
+            self.velocity = direction * self.speed * modifiers.speed
 
         
         new_y = self.y + self.velocity
@@ -46,6 +66,8 @@ class Paddle:
         self.height = new_height
 
 class Ball:
+    __slots__ = ('x', 'y', 'speed_x', 'speed_y', 'size', 'last_player', 'modifiers')
+
     def __init__(self, x, y, speed_x, speed_y, size=7):
         self.x = x
         self.y = y
@@ -53,6 +75,7 @@ class Ball:
         self.speed_y = speed_y
         self.size = size
         self.last_player = None  
+        self.modifiers = BallModifiers()
 
     def reset(self, x, y, speed_x, speed_y):
         self.x = x
@@ -62,7 +85,11 @@ class Ball:
         self.last_player = None  
 
 class PowerUpOrb:
-    def __init__(self, game_id, effect_type, terrain_rect, color=None):
+    __slots__ = ('id', 'game_id', 'effect_type', 'size', 'color', 'active', 'x', 'y', 'spawn_time',
+                 'duration', 'effect_duration', 'in_cooldown', 'expiry_timer')
+
+    def __init__(self, game_id, object_id, effect_type, color=None):
+        self.id = object_id
         self.game_id = game_id
         self.effect_type = effect_type  
         self.size = 15
@@ -70,111 +97,40 @@ class PowerUpOrb:
         self.active = False
         self.x = 0
         self.y = 0
-        self.rect = None
         self.spawn_time = 0
         self.duration = 10
         self.effect_duration = 5
         self.in_cooldown = False
-        self.cooldown_end_time = 0
-
-        
-        self.spawn_area = {
-            'left': terrain_rect['left'] + (terrain_rect['width'] * 0.25),
-            'right': terrain_rect['left'] + (terrain_rect['width'] * 0.75),
-            'top': terrain_rect['top'] + (terrain_rect['height'] * 0.1),
-            'bottom': terrain_rect['top'] + (terrain_rect['height'] * 0.9)
-        }
+        self.expiry_timer = None
 
     def get_default_color(self):
-        colors = {
-            'invert': (255, 105, 180),  # Pink
-            'shrink': (255, 0, 0),      # Red
-            'ice': (0, 255, 255),       # Cyan
-            'speed': (255, 215, 0),     # Gold
-            'flash': (255, 255, 0),     # Yellow
-            # 'sticky': (50, 205, 50)     # Lime green
-        }
-        return colors.get(self.effect_type, (255, 255, 255))
+        return POWERUP_COLORS.get(self.effect_type, (255, 255, 255))
 
     def start_cooldown(self): 
-        """Start cooldown period that prevents this type of powerup from spawning"""
+        """Start cooldown period that prevents this type of powerup from spawning (ended by a game timer)"""
         self.in_cooldown = True
-        self.cooldown_end_time = time.time() + self.duration + self.effect_duration
-        print(f"[PowerUpOrb] {self.effect_type} cooldown started until: {self.cooldown_end_time}")
+        log.debug("%s cooldown started", self.effect_type)
+
+    def end_cooldown(self):
+        self.in_cooldown = False
+        log.debug("%s cooldown ended", self.effect_type)
 
     def check_cooldown(self): 
         """Check if powerup is in cooldown period"""
-        if self.in_cooldown:
-            if time.time() >= self.cooldown_end_time:
-                self.in_cooldown = False
-                print(f"[PowerUpOrb] {self.effect_type} cooldown ended")
-                return False
-            return True
-        return False
-
-    def check_position_valid(self, x, y, powerup_orbs, bumpers):
-        
-        MIN_POWERUP_DISTANCE = 40
-        MIN_BUMPER_DISTANCE = 40
-
-        
-        active_powerups = 0
-        active_bumpers = 0
-
-        for orb in powerup_orbs:
-            if orb.active and orb != self:
-                active_powerups += 1
-                distance = math.hypot(x - orb.x, y - orb.y)
-                print(f"[DEBUG] PowerUp checking distance to other powerup: {distance}")
-                if distance < MIN_POWERUP_DISTANCE:
-                    print(f"[DEBUG] PowerUp spawn rejected: too close to other powerup ({distance} < {MIN_POWERUP_DISTANCE})")
-                    return False
-
-        
-        MIN_BUMPER_DISTANCE = 40
-        for bumper in bumpers:
-            if bumper.active:
-                active_bumpers += 1
-                distance = math.hypot(x - bumper.x, y - bumper.y)
-                print(f"[DEBUG] PowerUp checking distance to bumper: {distance}")
-                if distance < MIN_BUMPER_DISTANCE:
-                    print(f"[DEBUG] PowerUp spawn rejected: too close to bumper ({distance} < {MIN_BUMPER_DISTANCE})")
-                    return False
-        print(f"[DEBUG] PowerUp spawn position check complete. Checked against {active_powerups} active powerups and {active_bumpers} active bumpers")
-        return True
+        return self.in_cooldown
 
-    def spawn(self, terrain_rect, powerup_orbs=None, bumpers=None):
+    def spawn(self, placement):
+        """Place l'orbe sur une position libre tirée par le moteur de placement de la partie."""
         if self.active or self.check_cooldown():
             return False
-        if powerup_orbs is None:
-            powerup_orbs = []
-        if bumpers is None:
-            bumpers = []
-
-        max_attempts = 100
-
-        for attempt in range(max_attempts):
-            
-            new_x = random.uniform(self.spawn_area['left'], self.spawn_area['right'])
-            new_y = random.uniform(self.spawn_area['top'], self.spawn_area['bottom'])
-
-            
-            center_x = terrain_rect['left'] + (terrain_rect['width'] / 2)
-            if abs(new_x - center_x) < 50:  
-                continue
-
-            
-            if self.check_position_valid(new_x, new_y, powerup_orbs, bumpers):
-                self.x = new_x
-                self.y = new_y
-                self.rect = (self.x, self.y, self.size, self.size)
-                self.active = True
-                self.spawn_time = time.time()
-                print(f"[DEBUG] Successfully spawned powerup after {attempt + 1} attempts")
-                return True
-            else:
-                print(f"[DEBUG] Attempt {attempt + 1} failed validation")
-        return False
+        position = placement.sample('powerup')
+        if position is None:
+            return False
+        self.x, self.y = position
+        self.active = True
+        self.spawn_time = time.time()
+        placement.occupy(self)
+        return True
 
     def activate(self):
         self.active = True
@@ -188,92 +144,34 @@ class PowerUpOrb:
         self.start_cooldown()
 
 class Bumper:
-    def __init__(self, game_id, terrain_rect):
+    __slots__ = ('id', 'game_id', 'size', 'color', 'active', 'x', 'y', 'spawn_time',
+                 'duration', 'expiry_timer', 'last_collision_time')
+
+    def __init__(self, game_id, object_id):
+        self.id = object_id
         self.game_id = game_id
         self.size = 20
-        self.color = (255, 255, 255)  
+        self.color = BUMPER_COLOR
         self.active = False
         self.x = 0
         self.y = 0
-        self.rect = None
         self.spawn_time = 0
         self.duration = 10
+        self.expiry_timer = None
         self.last_collision_time = 0 
 
-        
-        self.spawn_area = {
-            'left': terrain_rect['left'] + (terrain_rect['width'] * 0.25),
-            'right': terrain_rect['left'] + (terrain_rect['width'] * 0.75),
-            'top': terrain_rect['top'] + (terrain_rect['height'] * 0.1),
-            'bottom': terrain_rect['top'] + (terrain_rect['height'] * 0.9)
-        }
-
-    def check_position_valid(self, x, y, powerup_orbs, bumpers): 
-        
-        MIN_POWERUP_DISTANCE = 40
-        MIN_BUMPER_DISTANCE = 40
-
-        
-        active_powerups = 0
-        active_bumpers = 0
-
-        for orb in powerup_orbs:
-            if orb.active:
-                active_powerups += 1
-                distance = math.hypot(x - orb.x, y - orb.y)
-                print(f"[DEBUG] Bumper checking distance to powerup: {distance}")
-                if distance < MIN_POWERUP_DISTANCE:
-                    print(f"[DEBUG] Bumper spawn rejected: too close to powerup ({distance} < {MIN_POWERUP_DISTANCE})")
-                    return False
-
-        
-        MIN_BUMPER_DISTANCE = 40
-        for bumper in bumpers:
-            if bumper.active and bumper != self:
-                active_bumpers += 1
-                distance = math.hypot(x - bumper.x, y - bumper.y)
-                print(f"[DEBUG] Bumper checking distance to other bumper: {distance}")
-                if distance < MIN_BUMPER_DISTANCE:
-                    print(f"[DEBUG] Bumper spawn rejected: too close to other bumper ({distance} < {MIN_BUMPER_DISTANCE})")
-                    return False
-        print(f"[DEBUG] Bumper spawn position check complete. Checked against {active_powerups} active powerups and {active_bumpers} active bumpers")
-        return True
-
-    def spawn(self, terrain_rect, powerup_orbs=None, bumpers=None):
+    def spawn(self, placement):
+        """Place le bumper sur une position libre tirée par le moteur de placement de la partie."""
         if self.active:
             return False
-
-        if powerup_orbs is None:
-            powerup_orbs = []
-        if bumpers is None:
-            bumpers = []
-
-        max_attempts = 100
-
- 
-        for _ in range(max_attempts):
-            
-            new_x = random.uniform(self.spawn_area['left'], self.spawn_area['right'])
-            new_y = random.uniform(self.spawn_area['top'], self.spawn_area['bottom'])
-
-            
-            center_x = terrain_rect['left'] + (terrain_rect['width'] / 2)
-            center_y = terrain_rect['top'] + (terrain_rect['height'] / 2)
-            dist_to_center = math.hypot(new_x - center_x, new_y - center_y)
-            
-            if dist_to_center < 30:  
-                continue
-
-            
-            if self.check_position_valid(new_x, new_y, powerup_orbs, bumpers):
-                self.x = new_x
-                self.y = new_y
-                self.rect = (self.x, self.y, self.size, self.size)
-                self.active = True
-                self.spawn_time = time.time()
-                return True
-
-        return False
+        position = placement.sample('bumper')
+        if position is None:
+            return False
+        self.x, self.y = position
+        self.active = True
+        self.spawn_time = time.time()
+        placement.occupy(self)
+        return True
     
     def activate(self):
         self.active = True
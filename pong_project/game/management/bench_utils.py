@@ -0,0 +1,28 @@
+# game/management/bench_utils.py
+
+import random
+
+from game.game_loop.game_world import GameWorld
+from game.game_loop.initialize_game import initialize_game_objects
+
+
+class BenchParameters:
+    """Paramètres des parties de benchmark : bumpers actifs, pas de bonus."""
+    paddle_size = 2
+    ball_speed = 2
+    bonus_enabled = False
+    obstacles_enabled = True
+
+
+def build_worlds(count, seed):
+    """<count> parties prêtes à simuler (bumpers placés), reproductibles pour une même <seed>."""
+    random.seed(seed)
+    parameters = BenchParameters()
+    worlds = []
+    for i in range(count):
+        game_id = f"bench-{i}"
+        world = GameWorld(game_id, parameters, *initialize_game_objects(game_id, parameters))
+        for bumper in world.bumpers:
+            bumper.spawn(world.placement)
+        worlds.append(world)
+    return worlds
@@ -0,0 +1,85 @@
+# game/management/commands/bench_broadcast.py
+
+import asyncio
+import json
+import random
+import time
+import msgpack
+from django.core.management.base import BaseCommand
+
+from game.game_loop.ball_utils import reset_ball
+from game.game_loop.physics import ScalarPhysics
+from game.game_loop.broadcast import game_state_fields, encode_json_frame
+from game.game_loop.wire_protocol import encode_game_state
+from game.management.bench_utils import build_worlds
+
+
+async def record_frames(count, seed):
+    """Joue <count> ticks d'une partie et retourne les (tick, état, frame JSON du StateEncoder)."""
+    inputs = random.Random(seed)
+    world = build_worlds(1, seed)[0]
+
+    physics = ScalarPhysics()
+    frames = []
+    while len(frames) < count:
+        world.paddle_velocity['left'] = inputs.choice((-8, 0, 8))
+        world.paddle_velocity['right'] = inputs.choice((-8, 0, 8))
+        scorers = await physics.simulate([world], 1)
+        if scorers[0]:
+            reset_ball(world)
+        world.events.clear()
+        state = game_state_fields(world)
+        data = world.state_encoder.encode(world.tick, state)
+        if data is not None:
+            frames.append((world.tick, state, data))
+    return frames
+
+
+# Même (dé)sérialisation que channels_redis, une fois par canal destinataire
+def through_channel_layer(message, channel_name):
+    message = dict(message, __asgi_channel__=channel_name)
+    return msgpack.unpackb(msgpack.packb(message, use_bin_type=True), raw=False)
+
+
+def per_recipient_encoding(frames, recipients):
+    """Ancien chemin : dict dans le channel layer, json.dumps dans chaque consumer."""
+    started = time.process_time()
+    for _, _, data in frames:
+        message = {'type': 'broadcast_game_state', 'data': data}
+        for i in range(recipients):
+            event = through_channel_layer(message, f"consumer-{i}")
+            json.dumps(event['data'])
+    return time.process_time() - started
+
+
+def encode_once(frames, recipients):
+    """Nouveau chemin : frames JSON et binaire encodées une fois, transmises telles quelles."""
+    started = time.process_time()
+    for tick, state, data in frames:
+        message = {
+            'type': 'game_tick',
+            'text': encode_json_frame(data),
+            'frame': encode_game_state(tick, state),
+        }
+        for i in range(recipients):
+            through_channel_layer(message, f"consumer-{i}")
+    return time.process_time() - started
+
+
+class Command(BaseCommand):
+    help = "Mesure le CPU par frame game_state selon le nombre de destinataires (sérialisation par client vs une seule fois)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+        parser.add_argument('--frames', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        frames = asyncio.run(record_frames(options['frames'], options['seed']))
+
+        count = len(frames)
+        self.stdout.write(f"{'recipients':>10} {'per recipient us/frame':>23} {'encode once us/frame':>21} {'speedup':>8}")
+        for recipients in options['recipients']:
+            before = per_recipient_encoding(frames, recipients) / count * 1e6
+            after = encode_once(frames, recipients) / count * 1e6
+            self.stdout.write(f"{recipients:>10} {before:>23.1f} {after:>21.1f} {before / after:>7.2f}x")
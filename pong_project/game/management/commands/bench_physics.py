@@ -0,0 +1,45 @@
+# game/management/commands/bench_physics.py
+
+import asyncio
+import random
+import time
+from django.core.management.base import BaseCommand
+
+from game.game_loop.ball_utils import reset_ball
+from game.game_loop.physics import ScalarPhysics
+from game.management.bench_utils import build_worlds
+
+
+async def run_physics(engine, worlds, steps, seed):
+    """Fait tourner <steps> ticks avec des inputs pseudo-aléatoires ; retourne la durée en secondes."""
+    random.seed(seed)
+    inputs = random.Random(seed)
+    elapsed = 0.0
+    for _ in range(steps):
+        for world in worlds:
+            world.paddle_velocity['left'] = inputs.choice((-1, 0, 1))
+            world.paddle_velocity['right'] = inputs.choice((-1, 0, 1))
+        started = time.perf_counter()
+        scorers = await engine.simulate(worlds, 1)
+        elapsed += time.perf_counter() - started
+        for world, scorer in zip(worlds, scorers):
+            if scorer:
+                reset_ball(world)
+    return elapsed
+
+
+class Command(BaseCommand):
+    help = "Mesure le débit de la physique du scheduler partagé (parties x ticks par seconde)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, nargs='+', default=[1, 10, 100, 1000])
+        parser.add_argument('--steps', type=int, default=900)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'games':>6} {'games*ticks/s':>14} {'us/game/tick':>13}")
+        for count in options['games']:
+            worlds = build_worlds(count, options['seed'])
+            elapsed = asyncio.run(run_physics(ScalarPhysics(), worlds, options['steps'], options['seed']))
+            rate = count * options['steps'] / elapsed
+            self.stdout.write(f"{count:>6} {rate:>14.0f} {1e6 / rate:>13.2f}")
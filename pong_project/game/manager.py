@@ -2,30 +2,37 @@
 
 import asyncio
 from game.tasks import start_game_loop
-import sys
+from game.shards import sharding_enabled, send_to_shard
+from game.game_loop.game_log import get_log
+
+log = get_log('manager')
 
 _GLOBAL_LOOP = None
 
 def set_global_loop(loop):
     global _GLOBAL_LOOP
     _GLOBAL_LOOP = loop
-    print(f"[manager.py] Global loop set: {loop}")
+    log.info("Global loop set: %s", loop)
 
 def get_global_loop():
     return _GLOBAL_LOOP
 
 def schedule_game(game_id):
+    if sharding_enabled():
+        send_to_shard('start', game_id)
+        log.info("game_id=%s envoyé au shard moteur", game_id)
+        return
     try:
         current_loop = asyncio.get_event_loop()
         if not current_loop.is_running():
             raise RuntimeError("Event loop is not running")
         current_loop.create_task(start_game_loop(game_id))
-        print(f"[schedule_game] create_task OK dans loop={current_loop} pour game_id={game_id}")
+        log.debug("create_task OK dans loop=%s pour game_id=%s", current_loop, game_id)
     except (RuntimeError, AttributeError) as e:
-        print("No current event loop in this thread, fallback run_coroutine_threadsafe", file=sys.stderr)
+        log.warning("No current event loop in this thread, fallback run_coroutine_threadsafe")
         global_loop = get_global_loop()
         if global_loop and global_loop.is_running():
             future = asyncio.run_coroutine_threadsafe(start_game_loop(game_id), global_loop)
-            print(f"[schedule_game] run_coroutine_threadsafe OK dans global_loop={global_loop} pour game_id={game_id}")
+            log.debug("run_coroutine_threadsafe OK dans global_loop=%s pour game_id=%s", global_loop, game_id)
         else:
-            print("No global loop available or loop is not running, game cannot be scheduled.", file=sys.stderr)
+            log.error("No global loop available or loop is not running, game cannot be scheduled.")
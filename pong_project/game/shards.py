@@ -0,0 +1,169 @@
+# game/shards.py
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+import zlib
+from django.conf import settings
+from game.game_loop.game_log import get_log
+
+log = get_log('shards')
+
+# Nombre de process moteur ; 0 = les parties tournent dans la boucle du serveur ASGI (comme avant)
+SHARD_COUNT = settings.GAME_ENGINE_SHARDS
+
+_SHARDS = []   # [ShardProcess] ; vide dans les process moteur eux-mêmes
+
+
+class ShardProcess:
+    """
+    Un process moteur : sa file de commandes, le process qui la consomme et les parties
+    qu'il fait tourner (retirées quand le shard signale leur fin dans <ended>).
+    send() peut être appelé depuis plusieurs threads (vues synchrones, boucle ASGI) : le
+    redémarrage d'un shard mort et le suivi des parties sont protégés par <lock>.
+    """
+    def __init__(self, index):
+        self.index = index
+        self.context = multiprocessing.get_context('spawn')
+        self.queue = self.context.Queue()
+        self.ended = self.context.Queue()
+        self.process = None
+        self.games = set()
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.process = self.context.Process(
+            target=run_shard,
+            args=(self.index, self.queue, self.ended),
+            name=f"game-shard-{self.index}",
+            daemon=True
+        )
+        self.process.start()
+        log.info("Shard %s started (pid=%s).", self.index, self.process.pid)
+
+    def send(self, command, game_id=None):
+        game_id = str(game_id) if game_id is not None else None
+        with self.lock:
+            self.collect_ended()
+            if self.process is None or not self.process.is_alive():
+                self.restart()
+            if command == 'start':
+                self.games.add(game_id)
+            self.queue.put((command, game_id))
+
+    def collect_ended(self):
+        while True:
+            try:
+                self.games.discard(self.ended.get_nowait())
+            except queue.Empty:
+                return
+
+    def restart(self):
+        """Relance un shard mort ; ses parties en cours sont perdues et passent en 'cancelled'."""
+        if self.process is not None:
+            lost = sorted(self.games)
+            log.error("Shard %s died (exitcode=%s), %d game(s) lost: %s",
+                      self.index, self.process.exitcode, len(lost), lost)
+            self.games.clear()
+            if lost:
+                # Thread dédié : send() peut être appelé depuis la boucle asyncio (ORM synchrone interdit)
+                threading.Thread(target=cancel_lost_games, args=(lost,), daemon=True).start()
+        self.start()
+
+
+def cancel_lost_games(game_ids):
+    """Passe en 'cancelled' les parties d'un shard mort qui n'étaient pas terminées."""
+    from django.db import connection
+    from game.models import GameSession
+    try:
+        cancelled = GameSession.objects.filter(pk__in=game_ids).exclude(
+            status__in=['finished', 'cancelled']
+        ).update(status='cancelled')
+        log.warning("%d lost game(s) marked cancelled.", cancelled)
+    except Exception as e:
+        log.error("Lost games not cancelled (%s): %s", game_ids, e)
+    finally:
+        connection.close()
+
+
+def sharding_enabled():
+    return bool(_SHARDS)
+
+
+def shard_for(game_id):
+    """Shard propriétaire d'une partie : stable pour un même game_id."""
+    return zlib.crc32(str(game_id).encode()) % SHARD_COUNT
+
+
+def start_shards():
+    """Lance les process moteur (appelé au démarrage du serveur ASGI)."""
+    if SHARD_COUNT <= 0 or _SHARDS:
+        return
+    for index in range(SHARD_COUNT):
+        shard = ShardProcess(index)
+        shard.start()
+        _SHARDS.append(shard)
+
+
+async def stop_shards(timeout=5):
+    """Arrête les process moteur ; les join() bloquants tournent dans des threads, en parallèle."""
+    for shard in _SHARDS:
+        if shard.process is not None and shard.process.is_alive():
+            shard.queue.put(('shutdown', None))
+    await asyncio.gather(*(
+        asyncio.to_thread(shard.process.join, timeout)
+        for shard in _SHARDS if shard.process is not None
+    ))
+    _SHARDS.clear()
+
+
+def send_to_shard(command, game_id):
+    """Envoie 'start' ou 'stop' au process qui possède la partie."""
+    _SHARDS[shard_for(game_id)].send(command, game_id)
+
+
+def run_shard(index, commands, ended):
+    """Point d'entrée d'un process moteur."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pong_project.settings')
+    import django
+    django.setup()
+    asyncio.run(shard_main(index, commands, ended))
+
+
+async def run_and_report(game_id, ended):
+    """Fait tourner la partie puis signale sa fin au process parent (voir ShardProcess.collect_ended)."""
+    from game.tasks import start_game_loop
+    try:
+        await start_game_loop(game_id)
+    finally:
+        ended.put(game_id)
+
+
+async def shard_main(index, commands, ended):
+    """
+    Boucle d'un process moteur : exécute les commandes reçues du serveur ASGI.
+    Les inputs (hash Redis de la partie) et les broadcasts (channel layer Redis)
+    ne passent pas par ce process parent : le shard les lit et les publie directement.
+    """
+    from game.manager import set_global_loop
+    from game.tasks import stop_game, ACTIVE_GAMES
+    from game.game_loop.tick_metrics import start_shard_metrics
+
+    loop = asyncio.get_running_loop()
+    set_global_loop(loop)
+    start_shard_metrics(index)
+    log.info("Shard %s ready (pid=%s).", index, os.getpid())
+
+    while True:
+        command, game_id = await loop.run_in_executor(None, commands.get)
+        if command == 'start':
+            loop.create_task(run_and_report(game_id, ended))
+        elif command == 'stop':
+            await stop_game(game_id)
+        elif command == 'shutdown':
+            for active_game_id in list(ACTIVE_GAMES):
+                await stop_game(active_game_id)
+            log.info("Shard %s shutting down.", index)
+            return
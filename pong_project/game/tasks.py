@@ -36,9 +36,14 @@
 #         print(f"[stop_game] Aucune tâche trouvée pour game_id={game_id} !")
 
 from game.game_loop.models_utils import set_gameSession_status
+from game.game_loop.status_cache import invalidate_status
+from game.shards import sharding_enabled, send_to_shard
 
 
 import asyncio
+from game.game_loop.game_log import get_log
+
+log = get_log('tasks')
 
 ACTIVE_GAMES = {}   
 SUBTASKS = {}       
@@ -49,15 +54,16 @@ async def start_game_loop(game_id):
     ACTIVE_GAMES[str(game_id)] = task
     SUBTASKS[str(game_id)] = set()  
 
-    print(f"[tasks.py] Game loop started for game_id={game_id}")
+    log.info("Game loop started for game_id=%s", game_id)
     try:
         await task
     except asyncio.CancelledError:
-        print("")
+        pass
     finally:
-        del ACTIVE_GAMES[str(game_id)]
+        ACTIVE_GAMES.pop(str(game_id), None)
         SUBTASKS.pop(str(game_id), None)
-        print(f"[tasks.py] Game loop ended for game_id={game_id}")
+        invalidate_status(game_id)
+        log.info("Game loop ended for game_id=%s", game_id)
 
 def register_subtask(game_id, subtask):
     """Enregistre une sous-tâche pour le game_id."""
@@ -73,12 +79,15 @@ def register_subtask(game_id, subtask):
     subtask.add_done_callback(_on_done)
 
 async def stop_game(game_id):
-    """Annule la tâche principale ET toutes les sous-tâches associées."""
-    
+    """Annule la tâche principale ET toutes les sous-tâches associées (dans le shard qui possède la partie)."""
+    if sharding_enabled():
+        send_to_shard('stop', game_id)
+        return
+
     main_task = ACTIVE_GAMES.get(str(game_id))
     if main_task:
         main_task.cancel()
-        print(f"[stop_game] Annulation de la tâche principale pour game_id={game_id}")
+        log.info("Annulation de la tâche principale pour game_id=%s", game_id)
 
     for st in SUBTASKS.get(str(game_id), []):
         st.cancel()
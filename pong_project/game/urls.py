@@ -8,6 +8,7 @@ from .views.gameLoading import LoadingView
 from .views.gameLocal import StartLocalGameView, CreateGameLocalView
 from .views.gameResults import GameResultsView 
 from .views.gameStatus import GetGameStatusView 
+from .views.gameMetrics import GameMetricsView
 from .views.gameOnline import CreateGameOnlineView, SendGameSessionInvitationView, AcceptGameInvitationView, RejectGameInvitationView, CheckGameInvitationStatusView, StartOnlineGameView, JoinOnlineGameAsLeftView, JoinOnlineGameAsRightView
 from .views.gameTournament import CreateTournamentView, CreateTournamentGameSessionView, StartTournamentGameSessionView, TournamentBracketView, TournamentNextGameView
 import logging
@@ -46,4 +47,5 @@ urlpatterns = [
     
     path('game_results/<uuid:game_id>/', GameResultsView.as_view(), name='get_local_results'),
     path('get_game_status/<uuid:game_id>/', GetGameStatusView.as_view(), name='get_game_status'),
+    path('metrics/', GameMetricsView.as_view(), name='metrics'),
 ]
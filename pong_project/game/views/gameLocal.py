@@ -7,6 +7,7 @@ from django.template.loader import render_to_string
 from game.models import GameSession
 from game.forms import GameParametersForm
 from game.manager import schedule_game
+from game.game_loop.status_cache import set_cached_status
 from pong_project.decorators import login_required_json
 from django.utils.translation import gettext as _
 
@@ -80,7 +81,8 @@ class StartLocalGameView(View):
             session.ready_left = True
             session.ready_right = True
             session.save()
-            
+            set_cached_status(session.id, session.status)
+
             schedule_game(game_id)
             logger.info("Partie locale %s lancée avec succès.", game_id)
             return JsonResponse({'status': 'success', 'message': _(f"Partie {game_id} lancée avec succès.")}, status=200)
@@ -0,0 +1,32 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, Http404
+from django.views import View
+from game.game_loop.tick_metrics import METRICS_ENABLED, get_snapshots, render_prometheus
+from game.shards import SHARD_COUNT
+
+
+class GameMetricsView(View):
+    """
+    Mesures du moteur de jeu au format texte Prometheus : durées des phases du tick
+    (p50/p99 agrégés par process), parties actives, retards d'horloge et de la boucle asyncio,
+    attente et appels en cours du pool de threads ORM (db_executor), saturation du pool
+    et latence des commandes Redis, frames envoyées / écrasées des connexions WebSocket.
+    Cadence réelle par partie, étiquetée par un numéro de partie du process (game_id dans les logs).
+    Les process moteur (GAME_ENGINE_SHARDS) sont lus dans le cache, avec leur propre label process.
+    Accès : ?token=GAME_METRICS_TOKEN (scraper) ou utilisateur staff ; 403 sinon.
+    """
+    def get(self, request, *args, **kwargs):
+        if not METRICS_ENABLED:
+            raise Http404
+        if not self.is_allowed(request):
+            return HttpResponse(status=403)
+        body = render_prometheus(get_snapshots(SHARD_COUNT))
+        return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    def is_allowed(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return True
+        token = settings.GAME_METRICS_TOKEN
+        return bool(token) and hmac.compare_digest(request.GET.get('token', ''), token)
@@ -13,6 +13,8 @@ from accounts.models import CustomUser
 from game.models import GameSession, GameInvitation
 from game.forms import GameParametersForm
 from game.manager import schedule_game
+from game.game_loop.status_cache import set_cached_status
+from game.game_loop.readiness import signal_player_ready
 from django.utils.translation import gettext as _  # Import pour la traduction
 from django.db import transaction
 
@@ -344,6 +346,8 @@ class StartOnlineGameView(View):
                 if session.ready_right and session.ready_left:
                     session.status = 'running'
                 session.save()
+                transaction.on_commit(lambda: set_cached_status(session.id, session.status))
+                transaction.on_commit(lambda: signal_player_ready(session.id))
                 logger.info("StartOnlineGameView: Session %s prête pour le joueur %s (ready_left=%s, ready_right=%s).", 
                             session.id, user_role, session.ready_left, session.ready_right)
             return JsonResponse({'status': 'success', 'message': _("Partie {} prête pour le joueur {}.").format(game_id, user_role)}, status=200)
@@ -11,6 +11,8 @@ from pong_project.decorators import login_required_json
 from game.forms import TournamentParametersForm
 from game.models import LocalTournament, GameSession, GameParameters
 from game.manager import schedule_game
+from game.game_loop.status_cache import set_cached_status
+from game.game_loop.readiness import signal_player_ready
 from django.utils.translation import gettext as _  # Import pour la traduction
 
 logger = logging.getLogger(__name__)
@@ -207,6 +209,8 @@ class StartTournamentGameSessionView(View):
             session.ready_left = True
             session.ready_right = True
             session.save()
+            set_cached_status(session.id, session.status)
+            signal_player_ready(session.id)
             return JsonResponse({'status': 'success', 'message': _(f"Partie {game_id} lancée avec succès.")}, status=200)
         except Exception as e:
             # logger.exception("Error in StartTournamentGameSessionView: %s", e)
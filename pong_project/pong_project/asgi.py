@@ -7,11 +7,15 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 from channels.auth import AuthMiddlewareStack
 from game.manager import set_global_loop
+from game.shards import start_shards, stop_shards
+from game.game_loop.game_log import get_log
 import game.routing 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pong_project.settings')
 django.setup()
 
+log = get_log('asgi')
+
 
 class LifespanHandler:
     async def __call__(self, scope, receive, send):
@@ -24,9 +28,11 @@ class LifespanHandler:
 
                 loop = asyncio.get_running_loop()
                 set_global_loop(loop)
-                print("[LifespanHandler] Event loop set as global loop.")
+                log.info("[LifespanHandler] Event loop set as global loop.")
+                start_shards()
                 await send({'type': 'lifespan.startup.complete'})
             elif event['type'] == 'lifespan.shutdown':
+                await stop_shards()
                 await send({'type': 'lifespan.shutdown.complete'})
                 break
 
@@ -241,4 +241,71 @@ LOGIN_URL = '/home/'
 # 16) Exposer la configuration Redis pour d'autres modules
 # ------------------------------------------------------------------
 REDIS_HOST = os.environ.get("REDIS_HOST")
-REDIS_PORT = int(os.environ.get("REDIS_PORT"))
\ No newline at end of file
+REDIS_PORT = int(os.environ.get("REDIS_PORT"))
+
+# ------------------------------------------------------------------
+# 17) Moteur de jeu (game loop)
+# ------------------------------------------------------------------
+# Durée (s) pendant laquelle la boucle de jeu se fie au statut en cache d'une partie
+GAME_STATUS_CACHE_TTL = float(os.environ.get("GAME_STATUS_CACHE_TTL", 1.0))
+
+# Threads (et donc connexions Postgres) réservés aux requêtes ORM des parties en cours
+GAME_DB_EXECUTOR_WORKERS = int(os.environ.get("GAME_DB_EXECUTOR_WORKERS", 4))
+
+# Fréquence de simulation (ticks/s) et nombre maximal de pas rattrapés après un retard.
+# Les vitesses (raquettes, balle, bonus) sont en pixels par tick, réglées pour 90 ticks/s :
+# changer GAME_TICK_RATE change la vitesse du jeu, il doit rester à 90.
+GAME_TICK_RATE = max(1, int(os.environ.get("GAME_TICK_RATE", 90)))
+GAME_MAX_CATCHUP_STEPS = int(os.environ.get("GAME_MAX_CATCHUP_STEPS", 5))
+
+# Fréquence d'envoi des game_state aux clients (par défaut, ou si <= 0 : à chaque tick), au plus GAME_TICK_RATE
+GAME_BROADCAST_RATE = int(os.environ.get("GAME_BROADCAST_RATE", GAME_TICK_RATE))
+if GAME_BROADCAST_RATE <= 0:
+    GAME_BROADCAST_RATE = GAME_TICK_RATE
+
+# Une keyframe game_state complète toutes les N frames, des deltas entre les deux
+GAME_KEYFRAME_INTERVAL = int(os.environ.get("GAME_KEYFRAME_INTERVAL", 60))
+
+# Mode du moteur : 'per_game' (une tâche par partie) ou 'shared' (un scheduler pour toutes les parties)
+GAME_ENGINE_MODE = os.environ.get("GAME_ENGINE_MODE", "per_game")
+
+# Nombre de process moteur (0 = parties dans la boucle du serveur ASGI). Ex : nombre de cœurs - 1
+GAME_ENGINE_SHARDS = int(os.environ.get("GAME_ENGINE_SHARDS", 0))
+
+# Autorise le sous-protocole WebSocket binaire 'pong.bin.v2' (sinon tous les clients restent en JSON)
+GAME_WS_BINARY_PROTOCOL = os.environ.get("GAME_WS_BINARY_PROTOCOL", "true").lower() in ("true", "1", "yes")
+
+# Frames livrées directement aux consumers du même process ; Redis seulement pour les autres process
+GAME_LOCAL_FANOUT = os.environ.get("GAME_LOCAL_FANOUT", "true").lower() in ("true", "1", "yes")
+
+# Durée (s) pendant laquelle le fan-out se fie à sa dernière lecture des consumers des autres process
+GAME_FANOUT_REMOTE_CHECK_TTL = float(os.environ.get("GAME_FANOUT_REMOTE_CHECK_TTL", 1.0))
+
+# Pool du client redis.asyncio partagé par le package game (connexions max, attente max en s quand il est plein)
+GAME_REDIS_POOL_SIZE = int(os.environ.get("GAME_REDIS_POOL_SIZE", 50))
+GAME_REDIS_POOL_TIMEOUT = float(os.environ.get("GAME_REDIS_POOL_TIMEOUT", 5.0))
+
+# Logs du moteur de jeu : niveau par défaut et niveaux par catégorie. Ex : "collisions=DEBUG,consumer=WARNING"
+GAME_LOG_LEVEL = os.environ.get("GAME_LOG_LEVEL", "INFO")
+GAME_LOG_CATEGORIES = os.environ.get("GAME_LOG_CATEGORIES", "")
+
+# Messages DEBUG : un sur N écrit ; au plus N messages DEBUG/INFO par seconde et par catégorie (0 = illimité)
+GAME_LOG_DEBUG_SAMPLE = int(os.environ.get("GAME_LOG_DEBUG_SAMPLE", 1))
+GAME_LOG_RATE_LIMIT = int(os.environ.get("GAME_LOG_RATE_LIMIT", 50))
+
+# Mémoire des derniers messages du moteur (0 = désactivée), écrite sur stdout avec `kill -USR1 <pid>`
+GAME_LOG_RING_SIZE = int(os.environ.get("GAME_LOG_RING_SIZE", 2000))
+GAME_LOG_RING_LEVEL = os.environ.get("GAME_LOG_RING_LEVEL", "INFO")
+
+# Mesures du moteur (durées des phases du tick, retard de la boucle asyncio), exposées sur /game/metrics/
+GAME_METRICS_ENABLED = os.environ.get("GAME_METRICS_ENABLED", "true").lower() in ("true", "1", "yes")
+# Jeton attendu dans ?token= par /game/metrics/ (vide = réservé aux utilisateurs staff)
+GAME_METRICS_TOKEN = os.environ.get("GAME_METRICS_TOKEN", "")
+
+# Échantillons gardés pour p50/p99 : par partie et pour l'agrégat du process
+GAME_METRICS_GAME_WINDOW = int(os.environ.get("GAME_METRICS_GAME_WINDOW", 256))
+GAME_METRICS_ENGINE_WINDOW = int(os.environ.get("GAME_METRICS_ENGINE_WINDOW", 4096))
+
+# Période (s) de la sonde de retard de la boucle asyncio et de publication des mesures des shards
+GAME_METRICS_LAG_INTERVAL = float(os.environ.get("GAME_METRICS_LAG_INTERVAL", 0.25))
+GAME_METRICS_PUBLISH_INTERVAL = float(os.environ.get("GAME_METRICS_PUBLISH_INTERVAL", 5.0))
@@ -61,6 +61,80 @@ function applyFlashEffect(gameState, duration = 300) {
 }
 
 
+// Protocole binaire 'pong.bin.v2' (voir game/game_loop/wire_protocol.py), JSON en repli.
+const BINARY_SUBPROTOCOL = 'pong.bin.v2';
+const JSON_SUBPROTOCOL = 'pong.json';
+const PROTOCOL_VERSION = 2;
+const FRAME_GAME_STATE = 1;
+const POSITION_SCALE = 10;
+const SPEED_SCALE = 100;
+const FLAG_FLASH_EFFECT = 1;
+const POWERUP_TYPES = ['invert', 'shrink', 'ice', 'speed', 'flash', 'sticky'];
+const INPUT_ACTIONS = { stop_move: 0, start_move: 1, resync: 2 };
+
+
+function decodeGameState(buffer) {
+  const view = new DataView(buffer);
+  if (view.getUint8(0) !== PROTOCOL_VERSION || view.getUint8(1) !== FRAME_GAME_STATE) {
+    return null;
+  }
+  const state = {
+    type: 'game_state',
+    tick: view.getUint32(2, true),
+    ball_x: view.getInt16(6, true) / POSITION_SCALE,
+    ball_y: view.getInt16(8, true) / POSITION_SCALE,
+    ball_size: view.getUint8(10),
+    ball_speed_x: view.getInt16(11, true) / SPEED_SCALE,
+    ball_speed_y: view.getInt16(13, true) / SPEED_SCALE,
+    paddle_left_y: view.getInt16(15, true) / POSITION_SCALE,
+    paddle_right_y: view.getInt16(17, true) / POSITION_SCALE,
+    paddle_width: view.getUint8(19),
+    paddle_left_height: view.getUint16(20, true),
+    paddle_right_height: view.getUint16(22, true),
+    score_left: view.getUint8(24),
+    score_right: view.getUint8(25),
+    flash_effect: (view.getUint8(26) & FLAG_FLASH_EFFECT) !== 0,
+    powerups: [],
+    bumpers: []
+  };
+  let offset = 27;
+  const powerupCount = view.getUint8(offset++);
+  for (let i = 0; i < powerupCount; i++, offset += 6) {
+    state.powerups.push({
+      id: view.getUint8(offset),
+      type: POWERUP_TYPES[view.getUint8(offset + 1)],
+      x: view.getInt16(offset + 2, true) / POSITION_SCALE,
+      y: view.getInt16(offset + 4, true) / POSITION_SCALE
+    });
+  }
+  const bumperCount = view.getUint8(offset++);
+  for (let i = 0; i < bumperCount; i++, offset += 6) {
+    state.bumpers.push({
+      id: view.getUint8(offset),
+      x: view.getInt16(offset + 1, true) / POSITION_SCALE,
+      y: view.getInt16(offset + 3, true) / POSITION_SCALE,
+      size: view.getUint8(offset + 5)
+    });
+  }
+  return state;
+}
+
+
+function sendAction(socket, action, player, direction) {
+  if (socket.protocol === BINARY_SUBPROTOCOL) {
+    let code = INPUT_ACTIONS[action];
+    if (player === 'right') code |= 0b100;
+    if (direction === 'down') code |= 0b1000;
+    socket.send(new Uint8Array([PROTOCOL_VERSION, code]));
+  } else {
+    const message = { action };
+    if (player) message.player = player;
+    if (direction) message.direction = direction;
+    socket.send(JSON.stringify(message));
+  }
+}
+
+
 function createSpawnEffect(type, x, y, effectType, color, collisionEffects, SPAWN_EFFECT_DURATION, EXPIRE_EFFECT_DURATION) {
   const effect = {
     type,
@@ -456,60 +530,32 @@ function initializeTouchControls(userRole, socket) {
   }
   btnUp.addEventListener('touchstart', (e) => {
     e.preventDefault();
-    socket.send(JSON.stringify({
-      action: "start_move",
-      player: userRole,
-      direction: "up"
-    }));
+    sendAction(socket, "start_move", userRole, "up");
   });
   btnUp.addEventListener('touchend', (e) => {
     e.preventDefault();
-    socket.send(JSON.stringify({
-      action: "stop_move",
-      player: userRole
-    }));
+    sendAction(socket, "stop_move", userRole);
   });
   btnUp.addEventListener('click', (e) => {
     e.preventDefault();
-    socket.send(JSON.stringify({
-      action: "start_move",
-      player: userRole,
-      direction: "up"
-    }));
+    sendAction(socket, "start_move", userRole, "up");
     setTimeout(() => {
-      socket.send(JSON.stringify({
-        action: "stop_move",
-        player: userRole
-      }));
+      sendAction(socket, "stop_move", userRole);
     }, 200);
   });
   btnDown.addEventListener('touchstart', (e) => {
     e.preventDefault();
-    socket.send(JSON.stringify({
-      action: "start_move",
-      player: userRole,
-      direction: "down"
-    }));
+    sendAction(socket, "start_move", userRole, "down");
   });
   btnDown.addEventListener('touchend', (e) => {
     e.preventDefault();
-    socket.send(JSON.stringify({
-      action: "stop_move",
-      player: userRole
-    }));
+    sendAction(socket, "stop_move", userRole);
   });
   btnDown.addEventListener('click', (e) => {
     e.preventDefault();
-    socket.send(JSON.stringify({
-      action: "start_move",
-      player: userRole,
-      direction: "down"
-    }));
+    sendAction(socket, "start_move", userRole, "down");
     setTimeout(() => {
-      socket.send(JSON.stringify({
-        action: "stop_move",
-        player: userRole
-      }));
+      sendAction(socket, "stop_move", userRole);
     }, 200);
   });
 }
@@ -570,7 +616,7 @@ function setupKeyboardControls(userRole, socket) {
     }
     if (player && direction && !keysPressed[evt.key]) {
       if (socket.readyState === WebSocket.OPEN) {
-        socket.send(JSON.stringify({ action, player, direction }));
+        sendAction(socket, action, player, direction);
       }
       keysPressed[evt.key] = true;
     }
@@ -593,7 +639,7 @@ function setupKeyboardControls(userRole, socket) {
     }
     if (player && keysPressed[evt.key]) {
       if (socket.readyState === WebSocket.OPEN) {
-        socket.send(JSON.stringify({ action, player }));
+        sendAction(socket, action, player);
       }
       keysPressed[evt.key] = false;
     }
@@ -696,13 +742,31 @@ function initLiveGame(config) {
     }
 
     
-    const socket = new WebSocket(config.wsUrl);
+    const socket = new WebSocket(config.wsUrl, [BINARY_SUBPROTOCOL, JSON_SUBPROTOCOL]);
+    socket.binaryType = 'arraybuffer';
     window.currentGameSocket = socket;
     let socketClosed = false;
 
     socket.onopen = () => {
       initializeTouchControls(config.userRole, socket);
     };
+    // Frames game_state : keyframe complète puis deltas chaînés par numéro de tick.
+    // Une frame manquée (base != dernier tick reçu) => demande de resync, deltas ignorés
+    // jusqu'à la prochaine keyframe.
+    let lastStateTick = null;
+    let resyncRequestedAt = 0;
+    const RESYNC_RETRY_DELAY = 1000;
+
+    function requestResync() {
+      lastStateTick = null;
+      const now = Date.now();
+      if (now - resyncRequestedAt < RESYNC_RETRY_DELAY) return;
+      resyncRequestedAt = now;
+      if (socket.readyState === WebSocket.OPEN) {
+        sendAction(socket, "resync");
+      }
+    }
+
     socket.onclose = () => {
       socketClosed = true;
       cancelAnimationFrame(animationId); 
@@ -712,14 +776,32 @@ function initLiveGame(config) {
 
     
     socket.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-  
-      if (data.type === 'game_state') {
+      const data = (event.data instanceof ArrayBuffer) ? decodeGameState(event.data) : JSON.parse(event.data);
+      if (!data) return;
+      handleMessage(data);
+    };
+
+    // Les événements d'un même tick arrivent groupés ({type: 'events', events: [...]}), dans l'ordre.
+    function handleMessage(data) {
+      if (data.type === 'events') {
+        data.events.forEach(handleMessage);
+      } else if (data.type === 'game_state') {
         const prevLeft = new Set(activeEffects.left);
         const prevRight = new Set(activeEffects.right);
         gameState = data;
         activeEffects.left = prevLeft;
         activeEffects.right = prevRight;
+        lastStateTick = data.tick;
+        resyncRequestedAt = 0;
+      } else if (data.type === 'game_state_delta') {
+        if (lastStateTick === null || data.base !== lastStateTick) {
+          requestResync();
+          return;
+        }
+        delete gameState.countdown;
+        delete gameState.scoreMsg;
+        Object.assign(gameState, data.changes);
+        lastStateTick = data.tick;
       } else if (data.type === 'powerup_spawned') {
         const powerupColor = {
           'invert': '#FF69B4',
@@ -777,7 +859,7 @@ function initLiveGame(config) {
           activeEffects[displaySide].delete(data.effect);
         }, data.duration * 1000);
       }
-    };
+    }
 
     
     if (!isTouchDevice()) {